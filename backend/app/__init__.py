@@ -1,20 +1,67 @@
+import os
+from importlib import import_module
 from flask import Flask
 from flask_cors import CORS
 from flask_mail import Mail
-from flask_migrate import Migrate
 from .config import Config
 from .models.db import db
+from .services.search_cache import search_cache
+from .services.conversation_store import conversation_store
 
-migrate = Migrate()
 mail = Mail()
 
-def create_app():
+# Every blueprint the app can serve: name -> (module, blueprint attribute).
+# Modules are only imported when a process role asks for them.
+BLUEPRINTS = {
+    "login": ("app.routes.login", "login_bp"),
+    "send_email": ("app.routes.send_email", "send_email_bp"),
+    "form": ("app.routes.form_routes", "form_bp"),
+    "google": ("app.routes.google_routes", "google_bp"),
+    "chat": ("app.routes.chat_routes", "chat_bp"),
+    "users": ("app.routes.usermanagement_route", "user_bp"),
+    "reports": ("app.routes.report_routes", "report_bp"),
+    "prices": ("app.routes.price_routes", "price_bp"),
+    "watchlist": ("app.routes.watchlist_routes", "watchlist_bp"),
+    "alerts": ("app.routes.alert_routes", "alert_bp"),
+}
+
+# Blueprints registered per process role. Workers and the scheduler only
+# need the app context (db, mail, config), not the HTTP routes.
+ROLE_BLUEPRINTS = {
+    "api": tuple(BLUEPRINTS),
+    "worker": (),
+    "scheduler": (),
+}
+
+
+def register_blueprints(app, names):
+    for name in names:
+        module_name, attribute = BLUEPRINTS[name]
+        app.register_blueprint(getattr(import_module(module_name), attribute), url_prefix='/api')
+
+
+def create_app(role=None, blueprints=None):
+    """Build the app for a process ``role`` (``api``, ``worker`` or ``scheduler``).
+
+    ``role`` defaults to the ``APP_ROLE`` environment variable, then ``api``.
+    ``blueprints`` overrides the role's blueprint list with explicit names.
+    """
+    role = role or os.getenv("APP_ROLE", "api")
+    if role not in ROLE_BLUEPRINTS:
+        raise ValueError(f"Unknown app role {role!r}; expected one of {', '.join(ROLE_BLUEPRINTS)}")
+
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.config["APP_ROLE"] = role
 
     db.init_app(app)
     mail.init_app(app)
-    migrate.init_app(app, db)
+    if app.config["DB_MIGRATIONS_ENABLED"]:
+        # Flask-Migrate pulls in alembic, which is only needed for `flask db`.
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    search_cache.init_app(app)
+    conversation_store.init_app(app)
 
     CORS(app,
     origins=[
@@ -29,7 +76,9 @@ def create_app():
 
     supports_credentials=True,
     methods=["GET", "POST", "PATCH", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"]
+    allow_headers=["Content-Type", "Authorization"],
+    # Paginated listings return the next page's cursor in a header.
+    expose_headers=["X-Next-Cursor"]
 )
 
    
@@ -43,32 +92,18 @@ def create_app():
 
 
 
-    from .routes.login import login_bp
-    app.register_blueprint(login_bp, url_prefix='/api')
-
-    from .routes.send_email import send_email_bp
-    app.register_blueprint(send_email_bp, url_prefix='/api')
-
-    from .routes.form_routes import form_bp  
-    app.register_blueprint(form_bp, url_prefix='/api')
-
-
-    from app.routes.google_routes import google_bp
-    app.register_blueprint(google_bp, url_prefix='/api')
-
-    from app.routes.chat_routes import chat_bp
-    app.register_blueprint(chat_bp, url_prefix='/api')
-
-    from app.routes.usermanagement_route import user_bp
-    app.register_blueprint(user_bp, url_prefix='/api')
-
-    from app.routes.report_routes import report_bp
-    app.register_blueprint(report_bp, url_prefix='/api')
+    register_blueprints(app, ROLE_BLUEPRINTS[role] if blueprints is None else blueprints)
 
 
     @app.route("/api/health")
     def health_check():
         return {"status": "ok", "message": "API is running"}, 200
 
+    @app.route("/api/metrics")
+    def metrics_snapshot():
+        from .utils.metrics import metrics
+        from .utils.inflight import inflight
+        return {**metrics.snapshot(), "inflight": inflight.snapshot()}, 200
+
 
     return app
\ No newline at end of file
@@ -1,19 +1,62 @@
+import multiprocessing
 import os
-from dotenv import load_dotenv
 
-# It's good practice to load_dotenv here as well if this file might be imported
-# directly in other scripts that don't go through run.py, though run.py is the primary place.
-# If you're certain run.py always loads it first, this line can be omitted here.
-load_dotenv() 
+# .env is loaded once by each entry point (run.py, outbox_worker.py, ...)
+# before the app package is imported; the flask CLI loads it on its own.
+
+def _default_pool_size(max_overflow: int) -> int:
+    """One connection per gunicorn request thread, capped by the server's connection budget.
+
+    Every worker process has its own pool, so ``workers x (pool_size + max_overflow)``
+    must stay within ``DB_MAX_CONNECTIONS`` (Postgres allows 100 by default; keep
+    headroom for migrations, workers and admin sessions). The worker count mirrors
+    gunicorn.conf.py's default.
+    """
+    threads = int(os.getenv("GUNICORN_THREADS", "16"))
+    workers = int(os.getenv("GUNICORN_WORKERS", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+    budget = int(os.getenv("DB_MAX_CONNECTIONS", "80")) // max(workers, 1)
+    return max(1, min(threads, budget - max_overflow))
+
 
 class Config:
     # Database config
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Registers Flask-Migrate (`flask db ...`); serving containers can turn it off
+    # to skip importing alembic at startup.
+    DB_MIGRATIONS_ENABLED = os.getenv("DB_MIGRATIONS_ENABLED", "true").lower() == "true"
+
+    # Connection pool, per worker process. pool_size defaults to one connection per
+    # gunicorn request thread (GUNICORN_THREADS) within the DB_MAX_CONNECTIONS budget
+    # (see _default_pool_size); the overflow covers background threads such as the
+    # inline outbox sender. Setting DB_POOL_SIZE overrides the budget: keep
+    # workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW) below the server's max_connections.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # seconds
+    }
+    if not (SQLALCHEMY_DATABASE_URI or "").startswith("sqlite"):
+        SQLALCHEMY_ENGINE_OPTIONS.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE") or _default_pool_size(int(os.getenv("DB_MAX_OVERFLOW", "2")))),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "2")),
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "10")),  # seconds
+        )
 
     # Flask secret
     SECRET_KEY = os.getenv("SECRET_KEY")
 
+    # Password hashing (Werkzeug method string; raise the cost per environment,
+    # e.g. "scrypt:65536:8:1" or "pbkdf2:sha256:1000000"). Existing rows are
+    # rehashed on their next successful login.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    LOGIN_CACHE_TTL = int(os.getenv("LOGIN_CACHE_TTL", "300"))  # seconds; 0 disables
+    LOGIN_CACHE_MAX_SIZE = int(os.getenv("LOGIN_CACHE_MAX_SIZE", "1024"))
+
+    # JWT lifetimes (seconds) and the verified-token cache size
+    JWT_ACCESS_TTL = int(os.getenv("JWT_ACCESS_TTL", "3600"))
+    JWT_REFRESH_TTL = int(os.getenv("JWT_REFRESH_TTL", str(14 * 24 * 3600)))
+    JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", "4096"))
+
     # Mail config
     MAIL_SERVER = 'smtp.gmail.com'
     MAIL_PORT = 587
@@ -22,9 +65,65 @@ class Config:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
 
+    # Email outbox worker. Production runs it as its own process (Procfile
+    # `worker: python outbox_worker.py`); the inline thread is for run.py dev.
+    EMAIL_OUTBOX_INLINE_WORKER = os.getenv("EMAIL_OUTBOX_INLINE_WORKER", "false").lower() == "true"
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+    EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", "2"))  # seconds
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+    EMAIL_OUTBOX_BACKOFF_BASE = float(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE", "30"))  # seconds
+    EMAIL_BULK_MAX_RECIPIENTS = int(os.getenv("EMAIL_BULK_MAX_RECIPIENTS", "500"))
+
     # ✅ SERP API key (existing)
     SERP_API_KEY = os.getenv("SERP_API_KEY")
 
+    # Search result cache (in front of SerpAPI)
+    SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    SEARCH_CACHE_BACKEND = os.getenv("SEARCH_CACHE_BACKEND", "memory")  # "memory" or "redis"
+    SEARCH_CACHE_MAX_SIZE = int(os.getenv("SEARCH_CACHE_MAX_SIZE", "512"))
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "300"))  # seconds
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Cross-worker single flight for cache misses (redis backend only)
+    SEARCH_CACHE_LOCK_ENABLED = os.getenv("SEARCH_CACHE_LOCK_ENABLED", "true").lower() == "true"
+    SEARCH_CACHE_LOCK_TTL = float(os.getenv("SEARCH_CACHE_LOCK_TTL", "30"))  # seconds
+    SEARCH_CACHE_LOCK_WAIT = float(os.getenv("SEARCH_CACHE_LOCK_WAIT", "20"))  # seconds
+
+    # Multi-query price monitoring
+    MONITOR_MAX_WORKERS = int(os.getenv("MONITOR_MAX_WORKERS", "8"))
+    MONITOR_RATE_LIMIT = float(os.getenv("MONITOR_RATE_LIMIT", "5"))  # SerpAPI requests per second
+    MONITOR_QUERY_TIMEOUT = float(os.getenv("MONITOR_QUERY_TIMEOUT", "30"))  # seconds per query
+
+    # Cross-merchant product matching (MinHash/LSH over offer titles)
+    PRODUCT_MATCHING_ENABLED = os.getenv("PRODUCT_MATCHING_ENABLED", "true").lower() == "true"
+    PRODUCT_MATCH_THRESHOLD = float(os.getenv("PRODUCT_MATCH_THRESHOLD", "0.6"))  # estimated title Jaccard
+    PRODUCT_INDEX_MAX_ENTRIES = int(os.getenv("PRODUCT_INDEX_MAX_ENTRIES", "200000"))
+    PRODUCT_INDEX_SEED_LIMIT = int(os.getenv("PRODUCT_INDEX_SEED_LIMIT", "20000"))
+
+    # Watchlist scheduler (scheduler.py)
+    WATCHLIST_DEFAULT_INTERVAL = int(os.getenv("WATCHLIST_DEFAULT_INTERVAL", "360"))  # minutes
+    WATCHLIST_MIN_INTERVAL = int(os.getenv("WATCHLIST_MIN_INTERVAL", "15"))  # minutes
+    WATCHLIST_BATCH_SIZE = int(os.getenv("WATCHLIST_BATCH_SIZE", "20"))
+    WATCHLIST_POLL_INTERVAL = float(os.getenv("WATCHLIST_POLL_INTERVAL", "10"))  # seconds
+    WATCHLIST_JITTER = float(os.getenv("WATCHLIST_JITTER", "0.1"))  # +/- fraction of the interval
+    WATCHLIST_INITIAL_SPREAD = int(os.getenv("WATCHLIST_INITIAL_SPREAD", "600"))  # seconds
+
+    # Price alerts (evaluated as /prices/monitor and the watchlist scheduler record prices)
+    PRICE_ALERTS_ENABLED = os.getenv("PRICE_ALERTS_ENABLED", "true").lower() == "true"
+
+    # Report request listing pagination
+    REPORT_REQUESTS_PAGE_SIZE = int(os.getenv("REPORT_REQUESTS_PAGE_SIZE", "100"))
+    REPORT_REQUESTS_MAX_PAGE_SIZE = int(os.getenv("REPORT_REQUESTS_MAX_PAGE_SIZE", "500"))
+    REPORT_BULK_MAX_ITEMS = int(os.getenv("REPORT_BULK_MAX_ITEMS", "1000"))
+
+    # User management listing
+    USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", "100"))
+    USERS_MAX_PAGE_SIZE = int(os.getenv("USERS_MAX_PAGE_SIZE", "500"))
+    USERS_CACHE_MAX_SIZE = int(os.getenv("USERS_CACHE_MAX_SIZE", "128"))
+    # "memory" caches pages per process: writes clear only that worker's pages and
+    # the TTL bounds staleness elsewhere. Use "redis" (REDIS_URL) with several workers.
+    USERS_CACHE_BACKEND = os.getenv("USERS_CACHE_BACKEND", "memory")
+    USERS_CACHE_TTL = int(os.getenv("USERS_CACHE_TTL", "30"))  # seconds
+
     # ✅ GEMINI API key (NEWLY ADDED)
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     if not GEMINI_API_KEY:
@@ -32,6 +131,23 @@ class Config:
         # after load_dotenv() has run.
         raise ValueError("GEMINI_API_KEY not found in environment variables. Please set it in your .env file.")
 
+    # Gemini HTTP client: timeouts (seconds), retries and circuit breaker
+    GEMINI_CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+    GEMINI_READ_TIMEOUT = float(os.getenv("GEMINI_READ_TIMEOUT", "60"))
+    GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+    GEMINI_POOL_SIZE = int(os.getenv("GEMINI_POOL_SIZE", "10"))
+    GEMINI_BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+    GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))
+
+    # Server-side chat sessions
+    CHAT_TOKEN_BUDGET = int(os.getenv("CHAT_TOKEN_BUDGET", "6000"))  # approx. tokens sent upstream per turn
+    # "memory" keeps conversations per process (single worker or sticky routing);
+    # use "redis" (REDIS_URL) when gunicorn runs several workers.
+    CHAT_STORE_BACKEND = os.getenv("CHAT_STORE_BACKEND", "memory")
+    CHAT_MAX_CONVERSATIONS = int(os.getenv("CHAT_MAX_CONVERSATIONS", "1000"))
+    CHAT_CONVERSATION_TTL = int(os.getenv("CHAT_CONVERSATION_TTL", "3600"))  # idle seconds
+    CHAT_SUMMARIZE = os.getenv("CHAT_SUMMARIZE", "false").lower() == "true"
+
     # Flask environment settings (assuming you want these too, as they were in previous config.py)
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     DEBUG = FLASK_ENV == 'development'
\ No newline at end of file
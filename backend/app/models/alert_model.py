@@ -0,0 +1,50 @@
+from app.models.db import db
+from datetime import datetime
+
+ALERT_RULE_TYPES = ("below", "drop_percent", "new_low")
+
+class PriceAlertRule(db.Model):
+    __tablename__ = "price_alert_rules"
+
+    id = db.Column(db.Integer, primary_key=True)
+    email = db.Column(db.String(255), nullable=False)
+    product_key = db.Column(db.String(64), nullable=False)
+    product_title = db.Column(db.String(500))
+    # Empty means "any merchant": the rule sees the product's best price.
+    merchant = db.Column(db.String(200), nullable=False, default="")
+    # One of ALERT_RULE_TYPES; threshold is a price for "below", a percentage for "drop_percent".
+    rule_type = db.Column(db.String(20), nullable=False)
+    threshold = db.Column(db.Float)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    # Evaluation state, updated incrementally as observations arrive.
+    last_price = db.Column(db.Float)
+    reference_price = db.Column(db.Float)
+    lowest_price = db.Column(db.Float)
+    last_observed_at = db.Column(db.DateTime)
+    last_triggered_at = db.Column(db.DateTime)
+    trigger_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Observations look up the active rules of their products only.
+        db.Index("ix_price_alert_rules_product_active", "product_key", "is_active"),
+        db.Index("ix_price_alert_rules_email", "email"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "email": self.email,
+            "productKey": self.product_key,
+            "productTitle": self.product_title,
+            "merchant": self.merchant or None,
+            "type": self.rule_type,
+            "threshold": self.threshold,
+            "isActive": self.is_active,
+            "lastPrice": self.last_price,
+            "lowestPrice": self.lowest_price,
+            "lastObservedAt": self.last_observed_at.isoformat() if self.last_observed_at else None,
+            "lastTriggeredAt": self.last_triggered_at.isoformat() if self.last_triggered_at else None,
+            "triggerCount": self.trigger_count,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -0,0 +1,31 @@
+from app.models.db import db
+from datetime import datetime
+
+class PriceObservation(db.Model):
+    __tablename__ = "price_observations"
+
+    id = db.Column(db.BigInteger, primary_key=True)
+    product_key = db.Column(db.String(64), nullable=False)
+    product_title = db.Column(db.String(500))
+    merchant = db.Column(db.String(200), nullable=False, default="")
+    price = db.Column(db.Float, nullable=False)
+    original_price = db.Column(db.Float)
+    search_query = db.Column(db.String(200))
+    link = db.Column(db.Text)
+    observed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Per-product time-range scans (series endpoint) and per-merchant series.
+        db.Index("ix_price_observations_product_time", "product_key", "observed_at"),
+        db.Index("ix_price_observations_product_merchant_time", "product_key", "merchant", "observed_at"),
+        db.Index("ix_price_observations_query_time", "search_query", "observed_at"),
+    )
+
+
+class ProductAlias(db.Model):
+    """Canonical product assigned to an offer ``product_key``, fixed once recorded."""
+    __tablename__ = "product_aliases"
+
+    product_key = db.Column(db.String(64), primary_key=True)
+    canonical_key = db.Column(db.String(64), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -16,7 +16,15 @@ class ReportRequest(db.Model):
     assigned_to = db.relationship("UserDetails", backref="assigned_reports")
 
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Keyset pagination for the newest-first listing, plus listing filters.
+        db.Index("ix_report_requests_created_at_id", "created_at", "id"),
+        db.Index("ix_report_requests_status", "status"),
+        db.Index("ix_report_requests_category", "category"),
+        db.Index("ix_report_requests_assigned_to_id", "assigned_to_id"),
+    )
 
 
 # from app.models.usermanagement_model import UserDetails
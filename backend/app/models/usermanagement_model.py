@@ -1,4 +1,5 @@
 from app.models.db import db
+from sqlalchemy import event
 
 class UserDetails(db.Model):  
     __tablename__ = 'user_management' 
@@ -12,4 +13,17 @@ class UserDetails(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20), nullable=False)
     password = db.Column(db.String(100), nullable=False)
-    is_active = db.Column(db.Boolean, default=True)
\ No newline at end of file
+    is_active = db.Column(db.Boolean, default=True)
+    # Lower-cased "first last" with collapsed whitespace, kept in sync below;
+    # indexed so assignees can be resolved by full name without a table scan.
+    name_key = db.Column(db.String(201), index=True)
+
+
+def normalize_full_name(full_name: str) -> str:
+    return " ".join((full_name or "").lower().split())
+
+
+@event.listens_for(UserDetails, "before_insert")
+@event.listens_for(UserDetails, "before_update")
+def _sync_name_key(mapper, connection, target):
+    target.name_key = normalize_full_name(f"{target.first_name} {target.last_name}")
@@ -0,0 +1,42 @@
+from app.models.db import db
+from datetime import datetime
+
+class WatchlistQuery(db.Model):
+    __tablename__ = "watchlist_queries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    search_query = db.Column(db.String(200), unique=True, nullable=False)
+    price_min = db.Column(db.Float)
+    price_max = db.Column(db.Float)
+    interval_minutes = db.Column(db.Integer, nullable=False, default=360)
+    is_active = db.Column(db.Boolean, nullable=False, default=True)
+    # Next refresh; while a scheduler holds the row it is the lease expiry.
+    next_run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_run_at = db.Column(db.DateTime)
+    last_changed_at = db.Column(db.DateTime)
+    # Hash of the last result set, and the price per "product_key|merchant" it contained.
+    last_result_hash = db.Column(db.String(64))
+    last_prices = db.Column(db.JSON)
+    consecutive_failures = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_watchlist_queries_active_next_run", "is_active", "next_run_at"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "query": self.search_query,
+            "priceRange": [self.price_min, self.price_max] if self.price_min is not None or self.price_max is not None else None,
+            "intervalMinutes": self.interval_minutes,
+            "isActive": self.is_active,
+            "nextRunAt": self.next_run_at.isoformat() if self.next_run_at else None,
+            "lastRunAt": self.last_run_at.isoformat() if self.last_run_at else None,
+            "lastChangedAt": self.last_changed_at.isoformat() if self.last_changed_at else None,
+            "trackedOffers": len(self.last_prices or {}),
+            "consecutiveFailures": self.consecutive_failures,
+            "lastError": self.last_error,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+        }
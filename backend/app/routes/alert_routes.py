@@ -0,0 +1,122 @@
+from flask import Blueprint, request, jsonify
+from app.models.db import db
+from app.models.alert_model import PriceAlertRule, ALERT_RULE_TYPES
+from app.services.price_history_service import PriceHistoryStore
+import logging
+import math
+import re
+
+alert_bp = Blueprint("alert_bp", __name__)
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _apply_fields(rule: PriceAlertRule, data: dict):
+    """Copy writable fields from a request body; returns an error message or None."""
+    if "type" in data:
+        if data["type"] not in ALERT_RULE_TYPES:
+            return f"type must be one of {', '.join(ALERT_RULE_TYPES)}"
+        rule.rule_type = data["type"]
+
+    if "threshold" in data:
+        try:
+            rule.threshold = float(data["threshold"]) if data["threshold"] is not None else None
+        except (TypeError, ValueError):
+            return "threshold must be a number"
+        if rule.threshold is not None and not math.isfinite(rule.threshold):
+            return "threshold must be a finite number"
+
+    if rule.rule_type in ("below", "drop_percent") and (rule.threshold is None or rule.threshold <= 0):
+        return f"threshold must be a positive number for '{rule.rule_type}' alerts"
+    if rule.rule_type == "drop_percent" and rule.threshold >= 100:
+        return "threshold must be below 100 for 'drop_percent' alerts"
+
+    if "isActive" in data:
+        rule.is_active = bool(data["isActive"])
+    return None
+
+
+@alert_bp.route("/alerts", methods=["GET"])
+def list_alerts():
+    query = PriceAlertRule.query
+    if request.args.get("email"):
+        query = query.filter(PriceAlertRule.email == request.args["email"].strip().lower())
+    if request.args.get("productKey"):
+        query = query.filter(PriceAlertRule.product_key == request.args["productKey"])
+    return jsonify([rule.to_dict() for rule in query.order_by(PriceAlertRule.id).all()]), 200
+
+
+@alert_bp.route("/alerts", methods=["POST"])
+def create_alert():
+    data = request.get_json() or {}
+    email = data.get("email")
+    email = email.strip().lower() if isinstance(email, str) else ""
+    if not EMAIL_PATTERN.match(email) or len(email) > PriceAlertRule.email.type.length:
+        return jsonify({"error": "A valid email is required"}), 400
+    product_key = data.get("productKey") or ""
+    if not isinstance(product_key, str):
+        return jsonify({"error": "productKey must be a string"}), 400
+    product_key = product_key.strip()
+    if not product_key:
+        return jsonify({"error": "productKey is required"}), 400
+    max_key_length = PriceAlertRule.product_key.type.length
+    if len(product_key) > max_key_length:
+        return jsonify({"error": f"productKey must be at most {max_key_length} characters"}), 400
+    for field in ("merchant", "productTitle"):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return jsonify({"error": f"{field} must be a string"}), 400
+    if data.get("type") is None:
+        return jsonify({"error": f"type is required ({', '.join(ALERT_RULE_TYPES)})"}), 400
+
+    # Rules are indexed by canonical product so they see offers from every
+    # merchant listing the product. Imported here to keep numpy off API startup.
+    from app.services.product_matching import get_product_index
+    index = get_product_index()
+    if index is not None:
+        product_key = index.canonical_key(product_key)
+
+    merchant = " ".join((data.get("merchant") or "").split())
+    if len(merchant) > PriceAlertRule.merchant.type.length:
+        return jsonify({"error": f"merchant must be at most {PriceAlertRule.merchant.type.length} characters"}), 400
+    rule = PriceAlertRule(
+        email=email,
+        product_key=product_key,
+        product_title=(data.get("productTitle") or "")[:500] or None,
+        merchant=merchant,
+        is_active=True,
+        trigger_count=0,
+    )
+    error = _apply_fields(rule, data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # "new_low" compares against recorded history, not just prices seen after creation.
+    rule.lowest_price = PriceHistoryStore().lowest_price(product_key, merchant or None)
+    db.session.add(rule)
+    db.session.commit()
+    return jsonify(rule.to_dict()), 201
+
+
+@alert_bp.route("/alerts/<int:rule_id>", methods=["PATCH"])
+def update_alert(rule_id):
+    rule = PriceAlertRule.query.get_or_404(rule_id)
+    data = request.get_json() or {}
+    type_changed = "type" in data and data["type"] != rule.rule_type
+    error = _apply_fields(rule, data)
+    if error:
+        db.session.rollback()
+        return jsonify({"error": error}), 400
+    if type_changed or "threshold" in data:
+        # Drops under a changed condition are measured from the current price.
+        rule.reference_price = rule.last_price
+    db.session.commit()
+    return jsonify(rule.to_dict()), 200
+
+
+@alert_bp.route("/alerts/<int:rule_id>", methods=["DELETE"])
+def delete_alert(rule_id):
+    rule = PriceAlertRule.query.get_or_404(rule_id)
+    db.session.delete(rule)
+    db.session.commit()
+    return jsonify({"message": "Alert deleted"}), 200
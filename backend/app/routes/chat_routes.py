@@ -1,11 +1,61 @@
-from flask import Blueprint, request, jsonify, current_app
-from app.services.gemini_service import GeminiService
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from app.services.conversation_store import conversation_store, truncate_history
+import json
 import logging
 
 chat_bp = Blueprint("chat", __name__)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _gemini():
+    # Imported on first use so the API process doesn't load requests at startup.
+    from app.services.gemini_service import get_gemini_service
+    return get_gemini_service()
+
+
+def _summarize_turns(previous_summary: str, turns: list) -> str:
+    transcript = "\n".join(
+        f"{turn.get('role', 'user')}: " + " ".join(part.get("text", "") for part in turn.get("parts", []))
+        for turn in turns
+    )
+    prompt = (
+        "Summarize the following conversation in at most 120 words, keeping facts, "
+        "product names, prices and open questions.\n"
+        + (f"Existing summary: {previous_summary}\n" if previous_summary else "")
+        + f"Conversation:\n{transcript}"
+    )
+    return _gemini().generate_text([{"role": "user", "parts": [{"text": prompt}]}])
+
+
+def _build_context(data: dict, user_message: str):
+    """Return ``(conversation_id, context, user_turn)`` for this turn.
+
+    Clients that still send the full ``history`` (and no ``conversationId``)
+    keep the stateless behaviour, trimmed to the token budget. Otherwise the
+    conversation is held server-side and only the new message is sent.
+    """
+    user_turn = {"role": "user", "parts": [{"text": user_message}]}
+    conversation_id = data.get("conversationId")
+    budget = current_app.config["CHAT_TOKEN_BUDGET"]
+
+    if conversation_id is None and "history" in data:
+        return None, truncate_history(data.get("history", []) + [user_turn], budget), user_turn
+
+    if not conversation_id or not conversation_store.exists(conversation_id):
+        conversation_id = conversation_store.create(data.get("history", []))
+
+    summarizer = _summarize_turns if current_app.config["CHAT_SUMMARIZE"] else None
+    context, _ = conversation_store.prepare(conversation_id, user_turn, summarizer=summarizer)
+    return conversation_id, context, user_turn
+
+
+def _discard_turn(conversation_id, user_turn):
+    """Drop the unanswered user turn so a retry doesn't stack two user turns."""
+    if conversation_id is not None:
+        conversation_store.discard(conversation_id, user_turn)
+
+
 @chat_bp.route("/chat", methods=["POST", "OPTIONS"])
 def chat():
     if request.method == "OPTIONS":
@@ -13,7 +63,6 @@ def chat():
 
     data = request.get_json()
     user_message = data.get("message")
-    chat_history = data.get("history", [])
 
     if not user_message:
         return jsonify({"error": "Message is required"}), 400
@@ -23,15 +72,94 @@ def chat():
         logger.error("GEMINI_API_KEY is not configured on the server.")
         return jsonify({"error": "Server configuration error: API key missing"}), 500
 
+    conversation_id = user_turn = None
     try:
-        gemini_service = GeminiService(api_key)
+        gemini_service = _gemini()
         
-        current_chat_history = chat_history + [{"role": "user", "parts": [{"text": user_message}]}]
+        conversation_id, context, user_turn = _build_context(data, user_message)
 
-        model_response = gemini_service.generate_text(current_chat_history)
-        
-        return jsonify({"response": model_response}), 200
+        model_response = gemini_service.generate_text(context)
+
+        if conversation_id is None:
+            return jsonify({"response": model_response}), 200
+
+        conversation_store.append(conversation_id, {"role": "model", "parts": [{"text": model_response}]})
+        return jsonify({"response": model_response, "conversationId": conversation_id}), 200
 
     except Exception as e:
         logger.exception(f"Error during chat processing: {e}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        _discard_turn(conversation_id, user_turn)
+        return jsonify({"error": str(e)}), 500
+
+
+def _sse(data: dict, event: str = None) -> str:
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+
+@chat_bp.route("/chat/stream", methods=["POST", "OPTIONS"])
+def chat_stream():
+    """Same contract as POST /chat, but relays the answer as Server-Sent Events.
+
+    Emits ``data: {"text": ...}`` per fragment, then ``event: done`` (with the
+    full response and conversation id) or ``event: error``.
+    """
+    if request.method == "OPTIONS":
+        return '', 204
+
+    data = request.get_json()
+    user_message = data.get("message")
+
+    if not user_message:
+        return jsonify({"error": "Message is required"}), 400
+
+    if not current_app.config.get("GEMINI_API_KEY"):
+        logger.error("GEMINI_API_KEY is not configured on the server.")
+        return jsonify({"error": "Server configuration error: API key missing"}), 500
+
+    try:
+        gemini_service = _gemini()
+        conversation_id, context, user_turn = _build_context(data, user_message)
+    except Exception as e:
+        # Before any event is sent, failures (e.g. the conversation store) are plain JSON errors.
+        logger.exception(f"Error preparing chat stream: {e}")
+        return jsonify({"error": str(e)}), 500
+
+    def generate():
+        fragments = []
+        stream = gemini_service.stream_text(context)
+        try:
+            for text in stream:
+                fragments.append(text)
+                yield _sse({"text": text})
+            model_response = "".join(fragments)
+            done = {"response": model_response}
+            if conversation_id is not None:
+                conversation_store.append(conversation_id, {"role": "model", "parts": [{"text": model_response}]})
+                done["conversationId"] = conversation_id
+            yield _sse(done, event="done")
+        except GeneratorExit:
+            logger.info("Chat stream cancelled by client.")
+            _discard_turn(conversation_id, user_turn)
+            raise
+        except Exception as e:
+            logger.exception(f"Error during chat streaming: {e}")
+            _discard_turn(conversation_id, user_turn)
+            yield _sse({"error": str(e)}, event="error")
+        finally:
+            # Propagates cancellation upstream: closes the Gemini HTTP response.
+            stream.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+
+@chat_bp.route("/chat/<string:conversation_id>", methods=["DELETE"])
+def end_conversation(conversation_id):
+    if not conversation_store.delete(conversation_id):
+        return jsonify({"error": "Conversation not found"}), 404
+    return jsonify({"message": "Conversation ended."}), 200
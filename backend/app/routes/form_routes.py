@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.form_model import UserForm
 from app.models.db import db
+from app.utils.passwords import hash_password
 
 form_bp = Blueprint('form', __name__)
 
@@ -17,7 +18,7 @@ def submit_form():
             role=data.get('role'),
             email=data.get('email'),
             phone=data.get('phone'),
-            password=data.get('password'),  # hash before saving in real apps
+            password=hash_password(data['password']) if data.get('password') else None,
         )
 
         db.session.add(user)
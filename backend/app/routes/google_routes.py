@@ -1,5 +1,12 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from datetime import datetime
+import importlib.util
 from app.services.serp_service import SerpService
+from app.services.search_cache import search_cache
+from app.services.google_price_monitor_service import GooglePriceMonitorService
+from app.services.export_service import iter_csv, iter_parquet, PARQUET_COMPRESSIONS
+from app.services.offers import price_range_bounds, price_range_error
+from app.utils.jwt_helper import jwt_required
 import logging
 
 google_bp = Blueprint("google", __name__)
@@ -31,11 +38,13 @@ def search_google_route():
                 "message": "SERP API key is not configured on the server"
             }), 500
 
-        serp = SerpService(api_key)
+        serp = SerpService(api_key, cache=search_cache)
 
         results = serp.search_google(
             query=query,
             category=category, 
+            bypass_cache=bool(data.get("bypassCache", False)),
+            refresh_cache=bool(data.get("refreshCache", False)),
         )
 
         return jsonify({
@@ -49,4 +58,79 @@ def search_google_route():
             "success": False,
             "error": "Search failed",
             "message": str(e)
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+@google_bp.route("/search/cache", methods=["GET"])
+@jwt_required(roles=["admin"])
+def search_cache_stats():
+    return jsonify(search_cache.stats()), 200
+
+
+@google_bp.route("/search/cache", methods=["DELETE"])
+@jwt_required(roles=["admin"])
+def clear_search_cache():
+    search_cache.clear()
+    return jsonify({"message": "Search cache cleared."}), 200
+
+
+@google_bp.route("/search/export", methods=["POST"])
+def export_search_results():
+    data = request.get_json() or {}
+    queries = [q.strip() for q in data.get("queries", []) if isinstance(q, str) and q.strip()]
+    if not queries:
+        return jsonify({"error": "Provide a non-empty 'queries' list"}), 400
+
+    export_format = data.get("format", "csv")
+    compression = data.get("compression", "snappy")
+    if export_format not in ("csv", "parquet"):
+        return jsonify({"error": "format must be 'csv' or 'parquet'"}), 400
+    if export_format == "parquet" and compression not in PARQUET_COMPRESSIONS:
+        return jsonify({"error": f"compression must be one of {', '.join(PARQUET_COMPRESSIONS)}"}), 400
+    error = price_range_error(data.get("priceRange"))
+    if error:
+        return jsonify({"error": error}), 400
+    # pyarrow is optional; check it before the 200 headers go out rather than
+    # failing mid-stream with a truncated download.
+    if export_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        return jsonify({"error": "Parquet export is not available on this server (pyarrow is not installed)"}), 501
+
+    # Product matching pulls in numpy, so it is only imported once an export runs.
+    from app.services.product_matching import get_product_index
+
+    config = current_app.config
+    service = GooglePriceMonitorService(config.get("SERP_API_KEY"), product_index=get_product_index())
+    price_range = price_range_bounds(*data["priceRange"]) if data.get("priceRange") else None
+    outcomes = service.iter_monitor_queries(
+        queries,
+        price_range=price_range,
+        max_workers=config["MONITOR_MAX_WORKERS"],
+        rate_limit=config["MONITOR_RATE_LIMIT"],
+        timeout=config["MONITOR_QUERY_TIMEOUT"],
+    )
+
+    def items():
+        # Each query's offers are written out as soon as that query finishes,
+        # so only the in-flight results are ever held in memory.
+        for outcome in outcomes:
+            if not outcome.ok:
+                logger.warning(f"Export skipped query '{outcome.query}': {outcome.error}")
+                continue
+            yield from outcome.results
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if export_format == "parquet":
+        body = iter_parquet(items(), compression=compression)
+        mimetype = "application/vnd.apache.parquet"
+        filename = f"google_shopping_results_{stamp}.parquet"
+    else:
+        body = iter_csv(items())
+        mimetype = "text/csv"
+        filename = f"google_shopping_results_{stamp}.csv"
+
+    # No Content-Length: the WSGI server sends the generator as a chunked response.
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
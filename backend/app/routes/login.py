@@ -1,11 +1,55 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+import hashlib
+import hmac
+import jwt
+import os
+import time
 from app.models.form_model import UserForm  
-from app.utils.jwt_helper import generate_jwt
+from app.models.usermanagement_model import UserDetails
+from app.models.db import db
+from app.services.search_cache import MemoryCacheBackend
+from app.utils.jwt_helper import REFRESH_TOKEN, generate_jwt, generate_refresh_jwt, verify_jwt
+from app.utils.metrics import metrics
+from app.utils.passwords import hash_password, verify_password
 
 login_bp = Blueprint('login', __name__)
 
+# Per-process key for credential fingerprints; never leaves memory.
+_FINGERPRINT_KEY = os.urandom(32)
+
+
+def _credential_cache():
+    """Recently verified logins: email -> (password fingerprint, user record)."""
+    cache = current_app.extensions.get("login_credential_cache")
+    if cache is None:
+        cache = current_app.extensions.setdefault("login_credential_cache", MemoryCacheBackend(
+            max_size=current_app.config["LOGIN_CACHE_MAX_SIZE"],
+            ttl=current_app.config["LOGIN_CACHE_TTL"],
+        ))
+    return cache
+
+
+def _fingerprint(email: str, password: str) -> bytes:
+    return hmac.new(_FINGERPRINT_KEY, f"{email}\0{password}".encode("utf-8"), hashlib.sha256).digest()
+
+
+def _dummy_hash() -> str:
+    dummy = current_app.extensions.get("login_dummy_hash")
+    if dummy is None:
+        dummy = current_app.extensions.setdefault("login_dummy_hash", hash_password(os.urandom(16).hex()))
+    return dummy
+
+
+def _server_timing(timings: dict) -> str:
+    for name, seconds in timings.items():
+        metrics.observe(f"login.{name}", seconds)
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+
+
 @login_bp.route('/login', methods=['POST'])
 def login():
+    started = time.perf_counter()
+    timings = {}
     try:
         data = request.get_json()
 
@@ -15,24 +59,86 @@ def login():
         if not email or not password:
             return jsonify({"error": "Both email and password are required."}), 400
 
-        user = UserForm.query.filter_by(email=email).first()
-
-        if user and user.password == password:
-            token = generate_jwt(user.id, user.role)
-            return jsonify({
-                "message": "Login successful ✅",
-                "token": token,
-                "user": {
-                    "id": user.id,
-                    "email": user.email,
-                    "role": user.role,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name
-                }
-            }), 200
+        use_cache = current_app.config["LOGIN_CACHE_TTL"] > 0
+        fingerprint = _fingerprint(email, password)
+        cached = _credential_cache().get(email)[0] if use_cache else None
+
+        if cached and hmac.compare_digest(cached["fingerprint"], fingerprint):
+            user_record = cached["user"]
+            metrics.incr("login.cache_hits")
         else:
-            return jsonify({"error": "Invalid email or password ❌"}), 401
+            t = time.perf_counter()
+            user = UserForm.query.filter_by(email=email).first()
+            timings["db"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            # Hash even for unknown emails so response time doesn't reveal which exist.
+            valid, needs_rehash = verify_password(user.password if user else _dummy_hash(), password)
+            timings["hash"] = time.perf_counter() - t
+
+            if not user or not valid:
+                timings["total"] = time.perf_counter() - started
+                response = jsonify({"error": "Invalid email or password ❌"})
+                response.headers["Server-Timing"] = _server_timing(timings)
+                return response, 401
+
+            if needs_rehash:
+                t = time.perf_counter()
+                user.password = hash_password(password)
+                db.session.commit()
+                timings["rehash"] = time.perf_counter() - t
+
+            user_record = {
+                "id": user.id,
+                "email": user.email,
+                "role": user.role,
+                "first_name": user.first_name,
+                "last_name": user.last_name
+            }
+            if use_cache:
+                _credential_cache().set(email, {"fingerprint": fingerprint, "user": user_record})
+
+        token = generate_jwt(user_record["id"], user_record["role"])
+        timings["total"] = time.perf_counter() - started
+        response = jsonify({
+            "message": "Login successful ✅",
+            "token": token,
+            "refreshToken": generate_refresh_jwt(user_record["id"], user_record["role"]),
+            "user": user_record
+        })
+        response.headers["Server-Timing"] = _server_timing(timings)
+        return response, 200
 
     except Exception as e:
+        db.session.rollback()
         print(f"Login error: {e}")
         return jsonify({"error": "Something went wrong on the server."}), 500
+
+
+
+@login_bp.route('/token/refresh', methods=['POST'])
+def refresh_token():
+    """Exchange a refresh token for a new access token without re-running login."""
+    data = request.get_json(silent=True) or {}
+    token = data.get('refreshToken')
+    if not token:
+        return jsonify({"error": "refreshToken is required."}), 400
+
+    try:
+        claims = verify_jwt(token, token_type=REFRESH_TOKEN)
+    except jwt.ExpiredSignatureError:
+        return jsonify({"error": "Refresh token has expired, please log in again."}), 401
+    except jwt.InvalidTokenError:
+        return jsonify({"error": "Invalid refresh token."}), 401
+
+    # Refresh tokens outlive role changes and deactivation, so re-check the account.
+    user = db.session.get(UserForm, claims['user_id'])
+    if user is None:
+        return jsonify({"error": "Invalid refresh token."}), 401
+    if UserDetails.query.filter_by(email=user.email, is_active=False).first() is not None:
+        return jsonify({"error": "This account has been deactivated."}), 401
+
+    return jsonify({
+        "token": generate_jwt(user.id, user.role),
+        "refreshToken": generate_refresh_jwt(user.id, user.role)
+    }), 200
@@ -0,0 +1,91 @@
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+from app.services.google_price_monitor_service import GooglePriceMonitorService
+from app.services.offers import price_range_bounds, price_range_error
+from app.services.price_alert_service import get_alert_engine
+from app.services.price_history_service import PriceHistoryStore, SERIES_BUCKETS
+from app.models.db import db
+import logging
+
+price_bp = Blueprint("price_bp", __name__)
+logger = logging.getLogger(__name__)
+
+
+def _parse_datetime_arg(name):
+    value = request.args.get(name)
+    return datetime.fromisoformat(value) if value else None
+
+
+@price_bp.route("/prices/products", methods=["GET"])
+def list_price_products():
+    limit = max(1, min(request.args.get("limit", 20, type=int), 100))
+    products = PriceHistoryStore().search_products(request.args.get("q"), limit=limit)
+    return jsonify(products), 200
+
+
+@price_bp.route("/prices/series", methods=["GET"])
+def get_price_series():
+    product_key = request.args.get("product")
+    if not product_key:
+        return jsonify({"error": "Missing product parameter"}), 400
+
+    bucket = request.args.get("bucket", "day")
+    if bucket not in SERIES_BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(SERIES_BUCKETS)}"}), 400
+
+    try:
+        start = _parse_datetime_arg("start")
+        end = _parse_datetime_arg("end")
+    except ValueError:
+        return jsonify({"error": "start/end must be ISO-8601 timestamps"}), 400
+
+    series = PriceHistoryStore().get_series(
+        product_key,
+        start=start,
+        end=end,
+        bucket=bucket,
+        merchant=request.args.get("merchant"),
+        per_merchant=request.args.get("perMerchant", "false").lower() == "true",
+    )
+    return jsonify({"product": product_key, "bucket": bucket, "series": series}), 200
+
+
+@price_bp.route("/prices/monitor", methods=["POST"])
+def monitor_and_record():
+    data = request.get_json() or {}
+    queries = [q.strip() for q in data.get("queries", []) if isinstance(q, str) and q.strip()]
+    if not queries:
+        return jsonify({"error": "Provide a non-empty 'queries' list"}), 400
+
+    error = price_range_error(data.get("priceRange"))
+    if error:
+        return jsonify({"error": error}), 400
+    price_range = price_range_bounds(*data["priceRange"]) if data.get("priceRange") else None
+    config = current_app.config
+    try:
+        # Product matching pulls in numpy, so it is only imported once monitoring runs.
+        from app.services.product_matching import get_product_index
+
+        service = GooglePriceMonitorService(config.get("SERP_API_KEY"), product_index=get_product_index(),
+                                            alert_engine=get_alert_engine())
+        outcomes = service.monitor_queries(
+            queries,
+            price_range=price_range,
+            max_workers=config["MONITOR_MAX_WORKERS"],
+            rate_limit=config["MONITOR_RATE_LIMIT"],
+            timeout=config["MONITOR_QUERY_TIMEOUT"],
+        )
+        offers = [item for outcome in outcomes if outcome.ok for item in outcome.results]
+        recorded = PriceHistoryStore().record_observations(offers, commit=False)
+        # Observations, alert state and queued alert emails commit together.
+        alerts = service.check_alerts(offers, commit=False)
+        db.session.commit()
+        return jsonify({
+            "recorded": recorded,
+            "alertsTriggered": alerts,
+            "queries": [outcome.to_dict() for outcome in outcomes],
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Price monitoring failed: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -1,17 +1,78 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import tuple_, insert, update
 from app.models.report_model import ReportRequest
-from app.models.usermanagement_model import UserDetails
+from app.models.usermanagement_model import UserDetails, normalize_full_name
 from app.models.db import db
+from app.utils.pagination import encode_cursor, decode_cursor, parse_limit
+import logging
 
 report_bp = Blueprint("report_bp", __name__)
+logger = logging.getLogger(__name__)
 
 
 @report_bp.route("/report-requests", methods=["GET"])
 def get_report_requests():
-    reports = ReportRequest.query.order_by(ReportRequest.created_at.desc()).all()
+    """Newest-first report listing with keyset pagination.
+
+    The body stays a plain list; the cursor for the next page is returned in
+    the ``X-Next-Cursor`` header (absent on the last page). Without ``limit``
+    or ``cursor`` the full list is returned, as existing clients expect.
+    Optional filters: ``status``, ``category`` and ``assignee`` (a user id,
+    or ``unassigned``).
+    """
+    try:
+        cursor = request.args.get("cursor")
+        limit = None
+        if cursor or request.args.get("limit") is not None:
+            limit = parse_limit(
+                request.args.get("limit"),
+                default=current_app.config["REPORT_REQUESTS_PAGE_SIZE"],
+                maximum=current_app.config["REPORT_REQUESTS_MAX_PAGE_SIZE"],
+            )
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Single projection query: only the listed columns, with the assignee's name
+    # joined in, instead of hydrating ORM rows and lazy-loading assigned_to per row.
+    query = db.session.query(
+        ReportRequest.id,
+        ReportRequest.request_id,
+        ReportRequest.category,
+        ReportRequest.product,
+        ReportRequest.status,
+        ReportRequest.report,
+        ReportRequest.download,
+        ReportRequest.created_at,
+        UserDetails.first_name,
+        UserDetails.last_name,
+    ).outerjoin(UserDetails, ReportRequest.assigned_to_id == UserDetails.id)
+    if request.args.get("status"):
+        query = query.filter(ReportRequest.status == request.args["status"])
+    if request.args.get("category"):
+        query = query.filter(ReportRequest.category == request.args["category"])
+    assignee = request.args.get("assignee")
+    if assignee == "unassigned":
+        query = query.filter(ReportRequest.assigned_to_id.is_(None))
+    elif assignee:
+        if not assignee.isdigit():
+            return jsonify({"error": "assignee must be a user id or 'unassigned'"}), 400
+        query = query.filter(ReportRequest.assigned_to_id == int(assignee))
+    if after:
+        query = query.filter(tuple_(ReportRequest.created_at, ReportRequest.id) < after)
+
+    query = query.order_by(ReportRequest.created_at.desc(), ReportRequest.id.desc())
+    if limit is None:
+        reports, has_more = query.all(), False
+    else:
+        # Fetch one extra row to learn whether another page exists.
+        reports = query.limit(limit + 1).all()
+        has_more = len(reports) > limit
+        reports = reports[:limit]
+
     result = []
     for r in reports:
-        assigned_name = f"{r.assigned_to.first_name} {r.assigned_to.last_name}" if r.assigned_to else ""
+        assigned_name = f"{r.first_name} {r.last_name}" if r.first_name is not None else ""
         result.append({
             "requestId": r.request_id,
             "category": r.category,
@@ -22,20 +83,27 @@ def get_report_requests():
             "assignedTo": assigned_name,
             "locked": bool(assigned_name),
         })
-    return jsonify(result), 200
+
+    response = jsonify(result)
+    if has_more:
+        last = reports[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 @report_bp.route("/report-requests", methods=["POST"])
 def create_report_request():
     data = request.get_json()
     try:
-        # Parse full name into first + last name
-        full_name = data.get("assignedTo", "")
+        # Resolve the assignee by id, or by full name via the indexed name_key
         assigned_user = None
-        if full_name:
-            parts = full_name.strip().split()
-            if len(parts) >= 2:
-                assigned_user = UserDetails.query.filter_by(first_name=parts[0], last_name=parts[1]).first()
+        if data.get("assignedToId") is not None:
+            assigned_user = db.session.get(UserDetails, data["assignedToId"])
+            if assigned_user is None:
+                return jsonify({"error": "User not found"}), 404
+        elif data.get("assignedTo"):
+            assigned_user = UserDetails.query.filter_by(name_key=normalize_full_name(data["assignedTo"])).first()
 
         new_report = ReportRequest(
             request_id=data["requestId"],
@@ -85,4 +153,235 @@ def assign_report_request(request_id):
     except Exception as e:
         print(f"[EXCEPTION] Error while saving to database: {str(e)}")
         db.session.rollback()
-        return jsonify({"error": "Internal Server Error"}), 500
\ No newline at end of file
+        return jsonify({"error": "Internal Server Error"}), 500
+
+
+# -------------------------------------------------------------------
+# Bulk endpoints: one lookup per kind of reference, one transaction
+# -------------------------------------------------------------------
+BULK_UPDATABLE_FIELDS = {
+    "status": "status",
+    "report": "report",
+    "download": "download",
+    "product": "product",
+    "category": "category",
+}
+
+
+# Maximum lengths of the String columns items may set.
+BULK_FIELD_LENGTHS = {
+    "requestId": ReportRequest.request_id.type.length,
+    "category": ReportRequest.category.type.length,
+    "product": ReportRequest.product.type.length,
+    "status": ReportRequest.status.type.length,
+    "report": ReportRequest.report.type.length,
+}
+
+
+def _field_error(item: dict):
+    """Validation message for the report fields an item sets, or None when they fit their columns."""
+    for key, max_length in BULK_FIELD_LENGTHS.items():
+        value = item.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            return f"{key} must be a string"
+        if len(value) > max_length:
+            return f"{key} must be at most {max_length} characters"
+    if "category" in item and not item["category"]:
+        return "category must not be empty"
+    if item.get("download") is not None and not isinstance(item["download"], bool):
+        return "download must be a boolean"
+    return None
+
+
+def _bulk_items(data):
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"error": "Provide a non-empty list of items"}), 400)
+    max_items = current_app.config["REPORT_BULK_MAX_ITEMS"]
+    if len(items) > max_items:
+        return None, (jsonify({"error": f"At most {max_items} items per request"}), 400)
+    return items, None
+
+
+def _request_id_of(item):
+    """The item's ``requestId`` if it is a non-empty string, else None."""
+    request_id = item.get("requestId") if isinstance(item, dict) else None
+    return request_id if isinstance(request_id, str) and request_id else None
+
+
+def _user_id(value):
+    """Coerce a user id the way the single-item endpoints accept it (``5`` or ``"5"``)."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _resolve_assignees(items):
+    """Map each item's assignee reference to a user id with at most two IN queries.
+
+    Items may carry ``assignedToId`` (a user id) or ``assignedTo`` (a full
+    name, matched on the indexed, normalized ``name_key``).
+    """
+    ids = {_user_id(item.get("assignedToId")) for item in items} - {None}
+    names = {normalize_full_name(item["assignedTo"]) for item in items if isinstance(item.get("assignedTo"), str)}
+
+    known_ids = set()
+    if ids:
+        known_ids = {row.id for row in db.session.query(UserDetails.id).filter(UserDetails.id.in_(ids))}
+    ids_by_name = {}
+    if names:
+        rows = db.session.query(UserDetails.id, UserDetails.name_key).filter(UserDetails.name_key.in_(names))
+        for row in rows.order_by(UserDetails.id):
+            ids_by_name.setdefault(row.name_key, row.id)
+    return known_ids, ids_by_name
+
+
+@report_bp.route("/report-requests/bulk", methods=["POST"])
+def bulk_create_report_requests():
+    items, error = _bulk_items(request.get_json())
+    if error:
+        return error
+
+    request_ids = [_request_id_of(item) for item in items]
+    existing = {
+        row.request_id for row in
+        db.session.query(ReportRequest.request_id).filter(ReportRequest.request_id.in_([r for r in request_ids if r]))
+    }
+    known_ids, ids_by_name = _resolve_assignees([item for item in items if isinstance(item, dict)])
+
+    results, rows, seen = [], [], set()
+    for index, item in enumerate(items):
+        request_id = request_ids[index]
+        result = {"index": index, "requestId": request_id}
+        results.append(result)
+        if request_id is None or not item.get("category"):
+            result.update({"status": "error", "error": "requestId and category are required"})
+            continue
+        field_error = _field_error(item)
+        if field_error:
+            result.update({"status": "error", "error": field_error})
+            continue
+        if request_id in existing or request_id in seen:
+            result.update({"status": "error", "error": "Duplicate requestId"})
+            continue
+
+        assigned_to_id = None
+        if item.get("assignedToId") is not None:
+            assigned_to_id = _user_id(item["assignedToId"])
+            if assigned_to_id not in known_ids:
+                result.update({"status": "error", "error": "User not found"})
+                continue
+        elif isinstance(item.get("assignedTo"), str) and item["assignedTo"]:
+            assigned_to_id = ids_by_name.get(normalize_full_name(item["assignedTo"]))
+
+        seen.add(request_id)
+        rows.append({
+            "request_id": request_id,
+            "category": item["category"],
+            "product": item.get("product", ""),
+            "status": item.get("status") or "Unassigned",
+            "report": item.get("report", ""),
+            "download": item.get("download") or False,
+            "assigned_to_id": assigned_to_id,
+        })
+        result["status"] = "created"
+
+    try:
+        if rows:
+            db.session.execute(insert(ReportRequest), rows)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Bulk report request write failed: {e}")
+        return jsonify({"error": "Could not save the report requests"}), 500
+
+    return jsonify({"created": len(rows), "results": results}), 200
+
+
+@report_bp.route("/report-requests/bulk", methods=["PATCH"])
+def bulk_update_report_requests():
+    """Update status/report/download/product/category for many requests at once."""
+    items, error = _bulk_items(request.get_json())
+    if error:
+        return error
+
+    request_ids = [request_id for request_id in map(_request_id_of, items) if request_id]
+    ids = dict(db.session.query(ReportRequest.request_id, ReportRequest.id).filter(ReportRequest.request_id.in_(request_ids)))
+
+    results, updates = [], []
+    for index, item in enumerate(items):
+        request_id = _request_id_of(item)
+        result = {"index": index, "requestId": request_id}
+        results.append(result)
+        if request_id not in ids:
+            result.update({"status": "error", "error": "ReportRequest not found"})
+            continue
+        values = {column: item[key] for key, column in BULK_UPDATABLE_FIELDS.items() if key in item}
+        if not values:
+            result.update({"status": "error", "error": "Nothing to update"})
+            continue
+        field_error = _field_error(item)
+        if field_error:
+            result.update({"status": "error", "error": field_error})
+            continue
+        updates.append({"id": ids[request_id], **values})
+        result["status"] = "updated"
+
+    try:
+        if updates:
+            db.session.execute(update(ReportRequest), updates)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Bulk report request write failed: {e}")
+        return jsonify({"error": "Could not save the report requests"}), 500
+
+    return jsonify({"updated": len(updates), "results": results}), 200
+
+
+@report_bp.route("/report-requests/bulk-assign", methods=["PATCH"])
+def bulk_assign_report_requests():
+    """Assign many requests at once: items are ``{"requestId", "assigned_to": <user id>}``."""
+    items, error = _bulk_items(request.get_json())
+    if error:
+        return error
+
+    request_ids = [request_id for request_id in map(_request_id_of, items) if request_id]
+    ids = dict(db.session.query(ReportRequest.request_id, ReportRequest.id).filter(ReportRequest.request_id.in_(request_ids)))
+    known_ids, _ = _resolve_assignees([
+        {"assignedToId": item.get("assigned_to")} for item in items if isinstance(item, dict)
+    ])
+
+    results, updates = [], []
+    for index, item in enumerate(items):
+        request_id = _request_id_of(item)
+        result = {"index": index, "requestId": request_id}
+        results.append(result)
+        if request_id not in ids:
+            result.update({"status": "error", "error": "ReportRequest not found"})
+            continue
+        assigned_to_id = _user_id(item.get("assigned_to"))
+        if assigned_to_id is None:
+            result.update({"status": "error", "error": "assigned_to must be a user id"})
+            continue
+        if assigned_to_id not in known_ids:
+            result.update({"status": "error", "error": "User not found"})
+            continue
+        updates.append({"id": ids[request_id], "assigned_to_id": assigned_to_id, "status": "Assigned"})
+        result["status"] = "assigned"
+
+    try:
+        if updates:
+            db.session.execute(update(ReportRequest), updates)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Bulk report request write failed: {e}")
+        return jsonify({"error": "Could not save the report requests"}), 500
+
+    return jsonify({"assigned": len(updates), "results": results}), 200
@@ -1,59 +1,25 @@
 from flask import Blueprint, request, jsonify, current_app
-from flask_mail import Message, Mail
-from datetime import datetime
+from flask_mail import Message
 import re
+from app.models.db import db
+from app.models.report_model import ReportRequest
+from app.models.usermanagement_model import UserDetails
+from app.services.email_outbox_service import enqueue_email, get_outbox_status, SmtpSession
+from app.services.email_template_service import (
+    report_email_renderer,
+    status_config_for,
+    priority_indicator_for,
+    timeline_html,
+)
 
 send_email_bp = Blueprint('send_email', __name__)
-mail_sender = Mail()
 
 # -------------------------------------------------------------------
 # Helper Functions (same as before)
 # -------------------------------------------------------------------
 def get_status_config(status: str) -> dict:
     """Professional status configuration with business-appropriate messaging."""
-    configs = {
-        "Complete": {
-            "color": "#16a34a",
-            "bg_color": "#dcfce7",
-            "icon": "✅",
-            "message": (
-                "<strong>Report Complete:</strong> Your request has been processed successfully. "
-                "Your report is now available for download through the management system."
-            ),
-            "urgency": "high"
-        },
-        "Inprogress": {
-            "color": "#f59e0b",
-            "bg_color": "#fef3c7",
-            "icon": "⏳",
-            "message": (
-                "<strong>Processing:</strong> Your request is currently being processed by our team. "
-                "You will be notified as soon as your report is ready."
-            ),
-            "urgency": "medium"
-        },
-        "Unassigned": {
-            "color": "#6b7280",
-            "bg_color": "#f3f4f6",
-            "icon": "📋",
-            "message": (
-                "<strong>Received:</strong> Your request has been received and is awaiting assignment. "
-                "You will be updated once a team member is assigned."
-            ),
-            "urgency": "low"
-        },
-        "Rejected": {
-            "color": "#dc2626",
-            "bg_color": "#fee2e2",
-            "icon": "❌",
-            "message": (
-                "<strong>Request Rejected:</strong> Unfortunately, we were unable to process your request. "
-                "Please contact support for further assistance."
-            ),
-            "urgency": "high"
-        }
-    }
-    return configs.get(status, configs["Unassigned"])
+    return status_config_for(status)
 
 def parse_frontend_data(body: str) -> dict:
     """Parse the frontend email body to extract structured data."""
@@ -98,188 +64,39 @@ def parse_frontend_data(body: str) -> dict:
 
 def get_priority_indicator(urgency: str) -> str:
     """Generate priority indicator with professional styling."""
-    indicators = {
-        "high": '<span style="background:#dc2626;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">HIGH PRIORITY</span>',
-        "medium": '<span style="background:#f59e0b;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">MEDIUM PRIORITY</span>',
-        "low": '<span style="background:#6b7280;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">LOW PRIORITY</span>'
-    }
-    return indicators.get(urgency, indicators["low"])
+    return priority_indicator_for(urgency)
 
 def generate_timeline_visual(status: str, assigned_to: str = "") -> str:
     """Professional visual timeline based on current status."""
-    steps = [
-        ("Request Submitted", "✅" if status in ["Complete", "Inprogress", "Rejected"] else "⭕"),
-        ("Team Assigned", "✅" if assigned_to and status in ["Complete", "Inprogress"] else "⏳" if status == "Unassigned" else "❌"),
-        ("Report Processing", "✅" if status == "Complete" else "⏳" if status == "Inprogress" else "⭕"),
-        ("Report Complete", "✅" if status == "Complete" else "⭕")
-    ]
-    
-    timeline_html = '<div style="margin:20px 0;"><h4 style="margin:0 0 10px 0;color:#374151;">Progress Timeline</h4>'
-    for i, (step_name, icon) in enumerate(steps):
-        connector = '<div style="width:2px;height:20px;background:#e5e7eb;margin-left:10px;"></div>' if i < len(steps) - 1 else ''
-        timeline_html += f'''
-        <div style="display:flex;align-items:center;margin:5px 0;">
-            <span style="font-size:16px;margin-right:10px;">{icon}</span>
-            <span style="color:#374151;font-weight:500;">{step_name}</span>
-        </div>
-        {connector}
-        '''
-    timeline_html += '</div>'
-    return timeline_html
+    return timeline_html(status, bool(assigned_to))
 
 def build_enhanced_email_html(data: dict) -> str:
-    """Build a professional email from parsed frontend data."""
-    status_config = get_status_config(data["status"])
-    priority_indicator = get_priority_indicator(status_config["urgency"])
-    timeline_visual = generate_timeline_visual(data["status"], data.get("assignedTo", ""))
-    date_str = datetime.now().strftime("%B %d, %Y • %I:%M %p")
-
-    # Greeting
-    hour = datetime.now().hour
-    if hour < 12:
-        greeting = "Good morning"
-    elif hour < 17:
-        greeting = "Good afternoon"
-    else:
-        greeting = "Good evening"
-
-    # Assignment section
-    assignment_section = ""
-    if data.get("assignedTo"):
-        assignment_section = f'''
-        <div style="background:#e0f2fe;border:1px solid #0288d1;border-radius:8px;padding:16px;margin:20px 0;">
-            <h4 style="margin:0 0 8px 0;color:#01579b;display:flex;align-items:center;">
-                <span style="margin-right:8px;">👤</span> Team Assignment
-            </h4>
-            <p style="margin:0;color:#0277bd;font-size:14px;">
-                Your request has been assigned to <strong>{data["assignedTo"]}</strong> from our expert team.
-            </p>
-        </div>
-        '''
-
-    # Download section
-    download_section = ""
-    if data.get("status") == "Complete" and data.get("download"):
-        download_section = f'''
-        <div style="background:linear-gradient(135deg,#16a34a,#15803d);
-                    border-radius:10px;
-                    padding:20px;
-                    margin:25px 0;
-                    text-align:center;
-                    color:white;">
-            <h3 style="margin:0 0 10px 0;font-size:18px;">Report Ready for Download</h3>
-            <p style="margin:0 0 18px 0;opacity:0.95;">
-                Your <strong>{data['product']}</strong> report is ready. Access the management system to download your report.
-            </p>
-            <div style="text-align:center;margin:20px 0;">
-                <a href="{data.get('report_link', '#')}" 
-                   style="display:inline-block;background:#16a34a;color:white;padding:12px 24px;text-decoration:none;border-radius:6px;font-weight:600;font-size:15px;">
-                    Access Report System
-                </a>
-            </div>
-        </div>
-        '''
-
-    return f'''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <title>Report Status Update - {data['requestId']}</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-</head>
-<body style="margin:0;padding:0;background-color:#f3f4f6;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,Arial,sans-serif;">
-    <div style="max-width:600px;margin:20px auto;background:#ffffff;border-radius:10px;overflow:hidden;box-shadow:0 7px 18px rgba(0,0,0,0.08);">
-        
-        <!-- Header -->
-        <div style="background:linear-gradient(135deg,#6366f1,#8b5cf6);padding:24px 16px;text-align:center;color:white;">
-            <h1 style="margin:0;font-size:22px;font-weight:600;">Report Management System</h1>
-            <p style="margin:7px 0 0 0;opacity:0.92;font-size:15px;">Status Update Notification</p>
-            <div style="margin-top:12px;">{priority_indicator}</div>
-        </div>
-        
-        <!-- Content -->
-        <div style="padding:24px 18px;">
-            <div style="margin-bottom:18px;">
-                <h2 style="margin:0 0 8px 0;color:#1e293b;font-size:18px;">{greeting},</h2>
-                <div style="background:{status_config['bg_color']};
-                           border-left:4px solid {status_config['color']};
-                           padding:12px 16px;
-                           border-radius:5px;
-                           margin:12px 0;">
-                    <div style="display:flex;align-items:center;margin-bottom:6px;">
-                        <span style="font-size:17px;margin-right:8px;">{status_config['icon']}</span>
-                        <strong style="color:{status_config['color']};font-size:15px;">Status Update</strong>
-                    </div>
-                    <p style="margin:0;color:#374151;line-height:1.5;">{status_config['message']}</p>
-                </div>
-            </div>
-
-            <!-- Request Details -->
-            <h3 style="margin:16px 0 10px 0;color:#1e293b;font-size:16px;">Request Details</h3>
-            <table style="width:100%;border-collapse:collapse;margin:12px 0;border-radius:7px;overflow:hidden;box-shadow:0 1px 4px rgba(0,0,0,0.05);">
-                <tr>
-                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Request ID</td>
-                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;font-family:monospace;font-weight:500;">{data['requestId']}</td>
-                </tr>
-                <tr>
-                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Product</td>
-                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">{data['product']}</td>
-                </tr>
-                <tr>
-                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Category</td>
-                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">
-                        <span style="background:#e0e7ff;color:#3730a3;padding:3px 7px;border-radius:4px;font-size:12px;font-weight:500;">
-                            {data['category'].upper()}
-                        </span>
-                    </td>
-                </tr>
-                <tr>
-                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Current Status</td>
-                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">
-                        <span style="display:inline-block;padding:5px 12px;border-radius:16px;color:white;background:{status_config['color']};font-size:12px;font-weight:600;">
-                            {status_config['icon']} {data['status'].upper()}
-                        </span>
-                    </td>
-                </tr>
-                <tr>
-                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Report ID</td>
-                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;font-family:monospace;">{data.get('report') or 'Pending'}</td>
-                </tr>
-                <tr>
-                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;">Last Updated</td>
-                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;">{date_str}</td>
-                </tr>
-            </table>
-
-            {assignment_section}
-            {timeline_visual}
-            {download_section}
-            
-            <div style="margin-top:22px;padding-top:16px;border-top:1.5px solid #e2e8f0;">
-                <p style="color:#374151;line-height:1.5;font-size:14px;">
-                    Thank you for using our Report Management System. We'll keep you updated on any changes to your request.
-                </p>
-                <p style="margin-top:16px;color:#374151;font-size:14px;">
-                    Best regards,<br>
-                    <strong style="color:#6366f1;">The LKCentrix Team</strong>
-                </p>
-            </div>
-        </div>
-        
-        <!-- Footer -->
-        <div style="background:#f8fafc;padding:16px;text-align:center;border-top:1px solid #e2e8f0;">
-            <p style="margin:0 0 4px 0;font-size:13px;color:#6b7280;">
-                This is an automated notification from the Report Management System.
-            </p>
-            <p style="margin:0;font-size:12px;color:#9ca3af;">
-                © 2025 LKCentrix Report Management System. All rights reserved.
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-'''
+    """Build a professional email from parsed frontend data.
+
+    Rendering goes through the precompiled per-status templates in
+    ``email_template_service``; only per-recipient fields are filled in here.
+    """
+    return report_email_renderer.render(data)
+
+def build_report_payload(data: dict) -> dict:
+    """Normalize structured (new format) report data for the email template."""
+    return {
+        "requestId": data.get("requestId", "N/A"),
+        "product": data.get("product", "Report"),
+        "category": data.get("category", "general"),
+        "status": data.get("status", "Updated"),
+        "report": data.get("report", ""),
+        "download": data.get("download", False),
+        "report_link": data.get("report_link", "#dashboard"),
+        "assignedTo": data.get("assignedTo", "")
+    }
+
+def report_email_subject(payload: dict) -> str:
+    return f"Report Update: {payload['requestId']} - {payload['status']}"
+
+def build_enhanced_email_html_batch(items: list) -> list:
+    """Render many status emails at once (shared timestamp and greeting)."""
+    return report_email_renderer.render_batch(items)
 
 # -------------------------------------------------------------------
 # Updated Route - Works with existing frontend
@@ -300,41 +117,172 @@ def send_email():
             parsed_data['email'] = recipient_email
             
             # Use parsed data to build enhanced email
-            status_config = get_status_config(parsed_data['status'])
             subject = f"Report Update: {parsed_data['requestId']} - {parsed_data['status']}"
             
-            msg = Message(
-                subject=subject,
-                sender=current_app.config['MAIL_USERNAME'],
-                recipients=[recipient_email],
-                html=build_enhanced_email_html(parsed_data)
-            )
+            html = build_enhanced_email_html(parsed_data)
         else:
             # NEW FORMAT: Use structured data directly
-            payload = {
-                "requestId": data.get("requestId", "N/A"),
-                "product": data.get("product", "Report"),
-                "category": data.get("category", "general"),
-                "status": data.get("status", "Updated"),
-                "report": data.get("report", ""),
-                "download": data.get("download", False),
-                "report_link": data.get("report_link", "#dashboard"),
-                "assignedTo": data.get("assignedTo", "")
-            }
-            
-            status_config = get_status_config(payload['status'])
-            subject = f"Report Update: {payload['requestId']} - {payload['status']}"
+            payload = build_report_payload(data)
             
-            msg = Message(
-                subject=subject,
-                sender=current_app.config['MAIL_USERNAME'],
-                recipients=[recipient_email],
-                html=build_enhanced_email_html(payload)
-            )
+            subject = report_email_subject(payload)
+            html = build_enhanced_email_html(payload)
 
-        mail_sender.send(msg)
-        return jsonify({"message": f"Email sent to {recipient_email}"}), 200
+        # Delivery happens in the outbox worker over a persistent SMTP connection.
+        message_id = enqueue_email(recipient_email, subject, html)
+        return jsonify({"message": f"Email queued for {recipient_email}", "messageId": message_id}), 202
 
     except Exception as e:
         current_app.logger.error(f"Email sending error: {e}")
         return jsonify({"error": "Something went wrong while sending email"}), 500
+
+
+@send_email_bp.route('/send-email/<string:message_id>', methods=['GET'])
+def get_email_status(message_id):
+    status = get_outbox_status(message_id)
+    if status is None:
+        return jsonify({"error": "Message not found"}), 404
+    return jsonify(status), 200
+
+
+
+# Report fields rendered into the email; each must be a string when supplied.
+REPORT_TEXT_FIELDS = ("requestId", "product", "category", "status", "report", "report_link", "assignedTo")
+FILTER_KEYS = ("status", "category", "requestIds")
+
+
+def _recipient_error(item: dict):
+    """Validation message for one bulk recipient, or None when it can be rendered."""
+    if not isinstance(item.get("email"), str) or not item["email"].strip():
+        return "Recipient email is required"
+    for field in REPORT_TEXT_FIELDS:
+        if item.get(field) is not None and not isinstance(item[field], str):
+            return f"{field} must be a string"
+    return None
+
+
+def _filter_error(filters) -> str:
+    if not isinstance(filters, dict) or not any(filters.get(key) for key in FILTER_KEYS):
+        return f"filter needs at least one of: {', '.join(FILTER_KEYS)}"
+    for key in ("status", "category"):
+        if filters.get(key) is not None and not isinstance(filters[key], str):
+            return f"filter.{key} must be a string"
+    request_ids = filters.get("requestIds")
+    if request_ids is not None and (not isinstance(request_ids, list)
+                                    or not all(isinstance(r, str) for r in request_ids)):
+        return "filter.requestIds must be a list of strings"
+    return None
+
+
+def _recipients_from_filter(filters: dict, limit: int = None) -> list:
+    """(email, payload) pairs for the assignees of the report requests matching ``filters``."""
+    query = db.session.query(
+        ReportRequest.request_id,
+        ReportRequest.product,
+        ReportRequest.category,
+        ReportRequest.status,
+        ReportRequest.report,
+        ReportRequest.download,
+        UserDetails.first_name,
+        UserDetails.last_name,
+        UserDetails.email,
+    ).join(UserDetails, ReportRequest.assigned_to_id == UserDetails.id)
+    if filters.get("status"):
+        query = query.filter(ReportRequest.status == filters["status"])
+    if filters.get("category"):
+        query = query.filter(ReportRequest.category == filters["category"])
+    if filters.get("requestIds"):
+        query = query.filter(ReportRequest.request_id.in_(filters["requestIds"]))
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [(row.email, build_report_payload({
+        "requestId": row.request_id,
+        "product": row.product or "Report",
+        "category": row.category,
+        "status": row.status,
+        "report": row.report or "",
+        "download": bool(row.download),
+        "report_link": f"#download/{row.request_id}" if row.download else "#dashboard",
+        "assignedTo": f"{row.first_name} {row.last_name}",
+    })) for row in query.all()]
+
+
+@send_email_bp.route('/send-email/bulk', methods=['POST'])
+def send_bulk_email():
+    """Fan out report status emails to many recipients in one call.
+
+    Body: ``{"recipients": [{"email": ..., <report fields>}, ...]}`` or
+    ``{"filter": {"status", "category", "requestIds"}}`` to notify the assignees
+    of matching report requests. By default messages are queued in the outbox
+    (202); with ``"sync": true`` they are sent immediately over a single SMTP
+    connection. Either way the response lists a result per recipient.
+    """
+    data = request.get_json() or {}
+    max_recipients = current_app.config["EMAIL_BULK_MAX_RECIPIENTS"]
+
+    errors = []
+    if data.get("filter") is not None:
+        error = _filter_error(data["filter"])
+        if error:
+            return jsonify({"error": error}), 400
+        # One row past the cap is enough to reject an oversized fan-out.
+        pairs = _recipients_from_filter(data["filter"], limit=max_recipients + 1)
+        errors = [None if email else "Recipient email is required" for email, _ in pairs]
+    elif isinstance(data.get("recipients"), list):
+        items = data["recipients"]
+        if len(items) > max_recipients:
+            return jsonify({"error": f"At most {max_recipients} recipients per request"}), 400
+        # Invalid entries keep their slot so results line up with the request array.
+        items = [item if isinstance(item, dict) else None for item in items]
+        errors = [_recipient_error(item) if item is not None else "Recipient must be an object" for item in items]
+        pairs = [(None, {}) if item is None else
+                 (item.get("email"), build_report_payload(item) if error is None else item)
+                 for item, error in zip(items, errors)]
+    else:
+        return jsonify({"error": "Provide a 'recipients' list or a 'filter' object"}), 400
+
+    if len(pairs) > max_recipients:
+        return jsonify({"error": f"At most {max_recipients} recipients per request"}), 400
+
+    results = [{"index": i, "email": email, "requestId": payload.get("requestId", "N/A")}
+               for i, (email, payload) in enumerate(pairs)]
+    valid = [i for i, error in enumerate(errors) if error is None]
+    for i, error in enumerate(errors):
+        if error is not None:
+            results[i].update({"status": "failed", "error": error})
+
+    htmls = build_enhanced_email_html_batch([pairs[i][1] for i in valid])
+    sync = bool(data.get("sync", False))
+
+    try:
+        if sync:
+            smtp = SmtpSession()
+            sender = current_app.config['MAIL_USERNAME']
+            try:
+                for i, html in zip(valid, htmls):
+                    email, payload = pairs[i]
+                    try:
+                        smtp.send(Message(subject=report_email_subject(payload), sender=sender, recipients=[email], html=html))
+                        results[i]["status"] = "sent"
+                    except Exception as e:
+                        current_app.logger.error(f"Bulk email to {email} failed: {e}")
+                        results[i].update({"status": "failed", "error": str(e)})
+            finally:
+                smtp.close()
+        else:
+            for i, html in zip(valid, htmls):
+                email, payload = pairs[i]
+                results[i]["messageId"] = enqueue_email(email, report_email_subject(payload), html, commit=False)
+                results[i]["status"] = "queued"
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk email error: {e}")
+        return jsonify({"error": "Something went wrong while sending emails"}), 500
+
+    summary = {
+        "total": len(results),
+        "succeeded": sum(1 for r in results if r["status"] in ("sent", "queued")),
+        "failed": sum(1 for r in results if r["status"] == "failed"),
+    }
+    return jsonify({"summary": summary, "results": results}), 200 if sync else 202
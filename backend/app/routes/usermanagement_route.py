@@ -1,23 +1,150 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
+from sqlalchemy import func, or_
 from app.models.usermanagement_model import UserDetails
 from app.models.db import db
+from app.services.search_cache import MemoryCacheBackend, RedisCacheBackend
+from app.utils.pagination import parse_limit
+from app.utils.metrics import metrics
+from app.utils.sql import LIKE_ESCAPE, like_pattern
+import logging
 
 user_bp = Blueprint('user_bp', __name__)
+logger = logging.getLogger(__name__)
+
+USER_LIST_COLUMNS = (
+    UserDetails.id,
+    UserDetails.first_name,
+    UserDetails.last_name,
+    UserDetails.gender,
+    UserDetails.dob,
+    UserDetails.role,
+    UserDetails.email,
+    UserDetails.phone,
+)
+
+
+def _users_cache():
+    """Cache of rendered /users pages, cleared by every user write.
+
+    With ``USERS_CACHE_BACKEND=redis`` the pages live in Redis, so a write
+    in one gunicorn worker invalidates them for every worker.
+    """
+    cache = current_app.extensions.get("users_list_cache")
+    if cache is None:
+        config = current_app.config
+        if config["USERS_CACHE_BACKEND"] == "redis":
+            cache = RedisCacheBackend(config["REDIS_URL"], ttl=config["USERS_CACHE_TTL"], prefix="users:")
+        else:
+            cache = MemoryCacheBackend(max_size=config["USERS_CACHE_MAX_SIZE"], ttl=config["USERS_CACHE_TTL"])
+        cache = current_app.extensions.setdefault("users_list_cache", cache)
+    return cache
+
+
+
+def _cached_page(key):
+    try:
+        return _users_cache().get(key)[0]
+    except Exception as e:
+        # A broken shared backend degrades to a miss; the page comes from the database.
+        metrics.incr("users_cache.errors")
+        logger.warning(f"[UsersCache] Backend read failed: {e}")
+        return None
+
+
+def _cache_page(key, page):
+    try:
+        _users_cache().set(key, page)
+    except Exception as e:
+        metrics.incr("users_cache.errors")
+        logger.warning(f"[UsersCache] Backend write failed: {e}")
+
+
+def invalidate_users_cache():
+    # Runs after the write has committed, so a failure here must not fail the request.
+    try:
+        _users_cache().clear()
+    except Exception as e:
+        metrics.incr("users_cache.errors")
+        logger.warning(f"[UsersCache] Backend clear failed, pages may be stale until they expire: {e}")
+
 
 @user_bp.route('/users', methods=['GET'])
 def get_users():
-    users = UserDetails.query.all()
-    return jsonify([{
-        "id": user.id,
-        "firstName": user.first_name,
-        "lastName": user.last_name,
-        "gender": user.gender,
-        "dob": user.dob,
-        "role": user.role,
-        "email": user.email,
-        "phone": user.phone,
-        # "isActive": user.is_active
-    } for user in users]), 200
+    """User listing ordered by id, paged with ``limit`` and ``cursor`` (last id seen).
+
+    Optional filters: ``q`` (name, email or role substring), ``role`` and
+    ``isActive``. The next cursor is returned in ``X-Next-Cursor``. Without
+    ``limit`` or ``cursor`` the full list is returned, as existing clients
+    expect. Pages are cached with an ETag until a user is created, updated,
+    deleted or toggled.
+    """
+    try:
+        cursor = request.args.get("cursor")
+        limit = None
+        if cursor or request.args.get("limit") is not None:
+            limit = parse_limit(
+                request.args.get("limit"),
+                default=current_app.config["USERS_PAGE_SIZE"],
+                maximum=current_app.config["USERS_MAX_PAGE_SIZE"],
+            )
+        after_id = int(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    search = (request.args.get("q") or "").strip()
+    role = request.args.get("role")
+    is_active = request.args.get("isActive")
+    cache_key = (limit, after_id, search.lower(), role, is_active)
+
+    cached = _cached_page(cache_key)
+    if cached is None:
+        query = db.session.query(*USER_LIST_COLUMNS)
+        if search:
+            pattern = like_pattern(search.lower())
+            query = query.filter(or_(
+                UserDetails.name_key.like(pattern, escape=LIKE_ESCAPE),
+                func.lower(UserDetails.email).like(pattern, escape=LIKE_ESCAPE),
+                func.lower(UserDetails.role).like(pattern, escape=LIKE_ESCAPE),
+            ))
+        if role:
+            query = query.filter(UserDetails.role == role)
+        if is_active is not None:
+            query = query.filter(UserDetails.is_active.is_(is_active.lower() == "true"))
+        if after_id is not None:
+            query = query.filter(UserDetails.id > after_id)
+
+        query = query.order_by(UserDetails.id)
+        if limit is None:
+            users, has_more = query.all(), False
+        else:
+            users = query.limit(limit + 1).all()
+            has_more = len(users) > limit
+            users = users[:limit]
+
+        response = jsonify([{
+            "id": user.id,
+            "firstName": user.first_name,
+            "lastName": user.last_name,
+            "gender": user.gender,
+            "dob": user.dob,
+            "role": user.role,
+            "email": user.email,
+            "phone": user.phone,
+            # "isActive": user.is_active
+        } for user in users])
+        response.add_etag()
+        cached = {
+            "body": response.get_data(as_text=True),
+            "etag": response.get_etag()[0],
+            "next_cursor": str(users[-1].id) if has_more else None,
+        }
+        _cache_page(cache_key, cached)
+
+    response = current_app.response_class(cached["body"], status=200, mimetype="application/json")
+    response.set_etag(cached["etag"])
+    if cached["next_cursor"]:
+        response.headers["X-Next-Cursor"] = cached["next_cursor"]
+    return response.make_conditional(request)
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
@@ -36,6 +163,7 @@ def create_user():
         )
         db.session.add(new_user)
         db.session.commit()
+        invalidate_users_cache()
         return jsonify({"message": "User added successfully."}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 400
@@ -57,6 +185,7 @@ def update_user(user_id):
     user.password = data['password']
 
     db.session.commit()
+    invalidate_users_cache()
     return jsonify({"message": "User updated successfully."}), 200
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
@@ -66,6 +195,7 @@ def delete_user(user_id):
         return jsonify({"error": "User not found"}), 404
     db.session.delete(user)
     db.session.commit()
+    invalidate_users_cache()
     return jsonify({"message": "User deleted successfully."}), 200
 
 @user_bp.route('/users/<int:user_id>/toggle', methods=['PATCH'])
@@ -75,4 +205,5 @@ def toggle_user(user_id):
         return jsonify({"error": "User not found"}), 404
     user.is_active = not user.is_active
     db.session.commit()
+    invalidate_users_cache()
     return jsonify({"message": "User status updated.", "isActive": user.is_active}), 200
\ No newline at end of file
@@ -0,0 +1,92 @@
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+from app.models.db import db
+from app.models.watchlist_model import WatchlistQuery
+from app.services.watchlist_scheduler import initial_run_at
+from app.services.offers import price_range_error
+import logging
+
+watchlist_bp = Blueprint("watchlist_bp", __name__)
+logger = logging.getLogger(__name__)
+
+
+def _apply_fields(entry: WatchlistQuery, data: dict):
+    """Copy writable fields from a request body; returns an error message or None."""
+    if "intervalMinutes" in data:
+        try:
+            interval = int(data["intervalMinutes"])
+        except (TypeError, ValueError):
+            return "intervalMinutes must be an integer"
+        minimum = current_app.config["WATCHLIST_MIN_INTERVAL"]
+        if interval < minimum:
+            return f"intervalMinutes must be at least {minimum}"
+        entry.interval_minutes = interval
+
+    if "priceRange" in data:
+        error = price_range_error(data["priceRange"])
+        if error:
+            return error
+        entry.price_min, entry.price_max = data["priceRange"] or (None, None)
+
+    if "isActive" in data:
+        entry.is_active = bool(data["isActive"])
+    return None
+
+
+@watchlist_bp.route("/watchlist", methods=["GET"])
+def list_watchlist():
+    entries = WatchlistQuery.query.order_by(WatchlistQuery.id).all()
+    return jsonify([entry.to_dict() for entry in entries]), 200
+
+
+@watchlist_bp.route("/watchlist", methods=["POST"])
+def add_watchlist_query():
+    data = request.get_json() or {}
+    query = " ".join((data.get("query") or "").split())
+    if not query:
+        return jsonify({"error": "query is required"}), 400
+    if WatchlistQuery.query.filter_by(search_query=query).first():
+        return jsonify({"error": "Query is already on the watchlist"}), 409
+
+    entry = WatchlistQuery(
+        search_query=query,
+        interval_minutes=current_app.config["WATCHLIST_DEFAULT_INTERVAL"],
+        is_active=True,
+        consecutive_failures=0,
+        next_run_at=initial_run_at(current_app.config["WATCHLIST_INITIAL_SPREAD"]),
+    )
+    error = _apply_fields(entry, data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    db.session.add(entry)
+    db.session.commit()
+    return jsonify(entry.to_dict()), 201
+
+
+@watchlist_bp.route("/watchlist/<int:entry_id>", methods=["PATCH"])
+def update_watchlist_query(entry_id):
+    entry = WatchlistQuery.query.get_or_404(entry_id)
+    error = _apply_fields(entry, request.get_json() or {})
+    if error:
+        db.session.rollback()
+        return jsonify({"error": error}), 400
+    db.session.commit()
+    return jsonify(entry.to_dict()), 200
+
+
+@watchlist_bp.route("/watchlist/<int:entry_id>", methods=["DELETE"])
+def delete_watchlist_query(entry_id):
+    entry = WatchlistQuery.query.get_or_404(entry_id)
+    db.session.delete(entry)
+    db.session.commit()
+    return jsonify({"message": "Watchlist query deleted"}), 200
+
+
+@watchlist_bp.route("/watchlist/<int:entry_id>/refresh", methods=["POST"])
+def refresh_watchlist_query(entry_id):
+    """Make an entry due now; the scheduler picks it up on its next poll."""
+    entry = WatchlistQuery.query.get_or_404(entry_id)
+    entry.next_run_at = datetime.utcnow()
+    db.session.commit()
+    return jsonify(entry.to_dict()), 202
@@ -0,0 +1,245 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate (~4 characters per token) plus per-turn framing overhead.
+CHARS_PER_TOKEN = 4
+TURN_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(turn: Dict) -> int:
+    chars = sum(len(part.get("text", "")) for part in turn.get("parts", []))
+    return chars // CHARS_PER_TOKEN + TURN_OVERHEAD_TOKENS
+
+
+def truncation_start(turns: List[Dict], budget: int) -> int:
+    """Index of the oldest turn that still fits in ``budget`` tokens, newest turns first.
+
+    The newest turn is always kept, and the kept window always starts on a
+    user turn so Gemini never sees a conversation opening with a model reply.
+    """
+    used = 0
+    start = len(turns)
+    for index in range(len(turns) - 1, -1, -1):
+        used += estimate_tokens(turns[index])
+        if used > budget and index < len(turns) - 1:
+            break
+        start = index
+    while start < len(turns) - 1 and turns[start].get("role") != "user":
+        start += 1
+    return start
+
+
+def truncate_history(turns: List[Dict], budget: int) -> List[Dict]:
+    return turns[truncation_start(turns, budget):]
+
+
+def summary_turns(summary: str) -> List[Dict]:
+    return [
+        {"role": "user", "parts": [{"text": f"Summary of our earlier conversation: {summary}"}]},
+        {"role": "model", "parts": [{"text": "Understood, I'll keep that context in mind."}]},
+    ]
+
+
+class Conversation:
+    __slots__ = ("turns", "summary", "last_used")
+
+    def __init__(self, turns: List[Dict] = None, summary: str = ""):
+        self.turns = list(turns or [])
+        self.summary = summary
+        self.last_used = time.monotonic()
+
+
+class MemoryConversationBackend:
+    """In-process LRU of conversations with an idle TTL.
+
+    Only correct when every turn of a conversation reaches the same process:
+    a single worker, or sticky routing in front of several.
+    """
+
+    shared = False
+
+    def __init__(self, max_conversations: int = 1000, ttl: int = 3600):
+        self.max_conversations = max_conversations
+        self.ttl = ttl
+        self._conversations = OrderedDict()
+
+    def _expire(self, now: float) -> None:
+        while self._conversations:
+            oldest_id, oldest = next(iter(self._conversations.items()))
+            if now - oldest.last_used <= self.ttl:
+                break
+            del self._conversations[oldest_id]
+
+    def load(self, conversation_id: str) -> Optional[Conversation]:
+        now = time.monotonic()
+        self._expire(now)
+        conversation = self._conversations.get(conversation_id)
+        if conversation is not None:
+            conversation.last_used = now
+            self._conversations.move_to_end(conversation_id)
+        return conversation
+
+    def save(self, conversation_id: str, conversation: Conversation) -> None:
+        self._expire(time.monotonic())
+        self._conversations[conversation_id] = conversation
+        self._conversations.move_to_end(conversation_id)
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def delete(self, conversation_id: str) -> bool:
+        return self._conversations.pop(conversation_id, None) is not None
+
+    def count(self) -> int:
+        return len(self._conversations)
+
+
+class RedisConversationBackend:
+    """Conversations kept in Redis so every gunicorn worker sees the same history.
+
+    Each conversation is one JSON value whose TTL is renewed on every write;
+    the number of conversations is bounded by the server's ``maxmemory-policy``.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int = 3600, prefix: str = "chat:"):
+        import redis  # optional dependency, only needed for the shared backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def load(self, conversation_id: str) -> Optional[Conversation]:
+        raw = self.client.get(self.prefix + conversation_id)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return Conversation(data.get("turns"), data.get("summary", ""))
+
+    def save(self, conversation_id: str, conversation: Conversation) -> None:
+        value = json.dumps({"turns": conversation.turns, "summary": conversation.summary})
+        self.client.set(self.prefix + conversation_id, value, ex=self.ttl)
+
+    def delete(self, conversation_id: str) -> bool:
+        return bool(self.client.delete(self.prefix + conversation_id))
+
+    def count(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+
+
+class ConversationStore:
+    """Store of chat sessions keyed by conversation id.
+
+    The default in-process backend evicts least recently used conversations
+    beyond ``max_conversations`` and expires idle ones after ``ttl`` seconds;
+    with several gunicorn workers set ``CHAT_STORE_BACKEND=redis`` so a
+    follow-up turn handled by another worker still finds its history. Each
+    conversation only keeps the turns that fit the token budget; older turns
+    are dropped or, when a summarizer is supplied, folded into a running summary.
+    """
+
+    def __init__(self, max_conversations: int = 1000, ttl: int = 3600, token_budget: int = 6000):
+        self.token_budget = token_budget
+        self.backend = MemoryConversationBackend(max_conversations, ttl)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        config = app.config
+        ttl = config.get("CHAT_CONVERSATION_TTL", 3600)
+        if config.get("CHAT_STORE_BACKEND") == "redis":
+            self.backend = RedisConversationBackend(config["REDIS_URL"], ttl=ttl)
+        else:
+            self.backend = MemoryConversationBackend(config.get("CHAT_MAX_CONVERSATIONS", 1000), ttl)
+        self.token_budget = config.get("CHAT_TOKEN_BUDGET", self.token_budget)
+        app.extensions["conversation_store"] = self
+
+    def create(self, turns: List[Dict] = None) -> str:
+        conversation_id = uuid.uuid4().hex
+        with self._lock:
+            self.backend.save(conversation_id, Conversation(truncate_history(turns or [], self.token_budget)))
+        return conversation_id
+
+    def exists(self, conversation_id: str) -> bool:
+        with self._lock:
+            return self.backend.load(conversation_id) is not None
+
+    def delete(self, conversation_id: str) -> bool:
+        with self._lock:
+            return self.backend.delete(conversation_id)
+
+    def append(self, conversation_id: str, turn: Dict) -> None:
+        with self._lock:
+            conversation = self.backend.load(conversation_id)
+            if conversation is not None:
+                conversation.turns.append(turn)
+                self.backend.save(conversation_id, conversation)
+
+    def discard(self, conversation_id: str, turn: Dict) -> bool:
+        """Undo ``prepare``'s append when the upstream call for ``turn`` failed.
+
+        Without this a retry would leave two consecutive user turns.
+        """
+        with self._lock:
+            conversation = self.backend.load(conversation_id)
+            if conversation is None or not conversation.turns or conversation.turns[-1] != turn:
+                return False
+            conversation.turns.pop()
+            self.backend.save(conversation_id, conversation)
+            return True
+
+    def prepare(self, conversation_id: str, user_turn: Dict,
+                summarizer: Callable[[str, List[Dict]], str] = None) -> Tuple[List[Dict], bool]:
+        """Append ``user_turn`` and return ``(context, found)`` for the upstream call.
+
+        ``context`` fits the token budget. Turns pushed out of the budget are
+        removed from the conversation; if ``summarizer(previous_summary,
+        dropped_turns)`` is given its result replaces the running summary.
+        If the upstream call then fails, ``discard`` the turn again.
+        """
+        with self._lock:
+            conversation = self.backend.load(conversation_id)
+            if conversation is None:
+                return [user_turn], False
+            conversation.turns.append(user_turn)
+            summary = conversation.summary
+            budget = self.token_budget
+            if summary:
+                budget -= sum(estimate_tokens(turn) for turn in summary_turns(summary))
+            start = truncation_start(conversation.turns, max(budget, 0))
+            dropped = conversation.turns[:start]
+            conversation.turns = conversation.turns[start:]
+            kept = list(conversation.turns)
+            self.backend.save(conversation_id, conversation)
+
+        if dropped:
+            logger.info(f"[ConversationStore] Dropping {len(dropped)} turns from conversation {conversation_id}")
+            if summarizer is not None:
+                try:
+                    summary = summarizer(summary, dropped)
+                    with self._lock:
+                        conversation = self.backend.load(conversation_id)
+                        if conversation is not None:
+                            conversation.summary = summary
+                            self.backend.save(conversation_id, conversation)
+                except Exception as e:
+                    logger.warning(f"[ConversationStore] Summarization failed, truncating only: {e}")
+
+        context = (summary_turns(summary) if summary else []) + kept
+        return context, True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {"conversations": self.backend.count(), "backend": type(self.backend).__name__}
+        if not self.backend.shared:
+            stats["max_conversations"] = self.backend.max_conversations
+        return stats
+
+
+conversation_store = ConversationStore()
@@ -0,0 +1,192 @@
+import logging
+import random
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from flask import current_app
+from flask_mail import Connection, Message
+
+from app.models.db import db
+from app.models.email_outbox_model import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# SMTP failures that mean the connection itself is gone and worth one reconnect.
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, OSError)
+
+
+def enqueue_email(recipient: str, subject: str, html: str, commit: bool = True) -> str:
+    """Queue a message for the outbox worker and return its message id."""
+    message_id = str(uuid.uuid4())
+    db.session.add(EmailOutbox(
+        message_id=message_id,
+        recipient=recipient,
+        subject=subject,
+        html=html,
+        status="queued",
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    ))
+    if commit:
+        db.session.commit()
+    return message_id
+
+
+def get_outbox_status(message_id: str) -> Dict:
+    row = EmailOutbox.query.filter_by(message_id=message_id).first()
+    if row is None:
+        return None
+    return {
+        "messageId": row.message_id,
+        "recipient": row.recipient,
+        "status": row.status,
+        "attempts": row.attempts,
+        "lastError": row.last_error,
+        "createdAt": row.created_at.isoformat() if row.created_at else None,
+        "sentAt": row.sent_at.isoformat() if row.sent_at else None,
+    }
+
+
+class SmtpSession:
+    """One SMTP connection reused across many sends.
+
+    Flask-Mail opens (and TLS-negotiates) a new connection per ``mail.send``;
+    this keeps a single ``Connection`` open and reconnects once if the server
+    dropped it. Must be used inside an app context.
+    """
+
+    def __init__(self):
+        self._connection = None
+
+    def _open(self):
+        self._connection = Connection(current_app.extensions["mail"]).__enter__()
+
+    def send(self, msg: Message) -> None:
+        if self._connection is None:
+            self._open()
+        try:
+            self._connection.send(msg)
+        except _CONNECTION_ERRORS:
+            logger.info("[SmtpSession] Connection lost, reconnecting.")
+            self.close()
+            self._open()
+            self._connection.send(msg)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._connection = None
+
+
+class OutboxWorker:
+    """Background sender draining the ``email_outbox`` table in batches.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers (or
+    gunicorn processes) can run side by side. Failed sends are retried with
+    jittered exponential backoff and dead-lettered after ``max_attempts``.
+    """
+
+    def __init__(self, app, batch_size: int = 50, poll_interval: float = 2.0, max_attempts: int = 5,
+                 backoff_base: float = 30.0, lease_seconds: int = 300):
+        self.app = app
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.lease_seconds = lease_seconds
+        self.smtp = SmtpSession()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, app):
+        config = app.config
+        return cls(
+            app,
+            batch_size=config["EMAIL_OUTBOX_BATCH_SIZE"],
+            poll_interval=config["EMAIL_OUTBOX_POLL_INTERVAL"],
+            max_attempts=config["EMAIL_OUTBOX_MAX_ATTEMPTS"],
+            backoff_base=config["EMAIL_OUTBOX_BACKOFF_BASE"],
+        )
+
+    def _claim_batch(self) -> List[EmailOutbox]:
+        now = datetime.utcnow()
+        rows = (
+            EmailOutbox.query
+            .filter(EmailOutbox.status.in_(("queued", "sending")), EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        for row in rows:
+            row.status = "sending"
+            row.next_attempt_at = lease_until
+        db.session.commit()
+        return rows
+
+    def _retry_delay(self, attempts: int) -> float:
+        return random.uniform(0.5, 1.0) * self.backoff_base * (2 ** (attempts - 1))
+
+    def run_once(self) -> int:
+        """Send one batch; returns the number of rows processed."""
+        rows = self._claim_batch()
+        if not rows:
+            self.smtp.close()
+            return 0
+
+        sender = current_app.config["MAIL_USERNAME"]
+        for row in rows:
+            row.attempts += 1
+            try:
+                self.smtp.send(Message(subject=row.subject, sender=sender, recipients=[row.recipient], html=row.html))
+                row.status = "sent"
+                row.sent_at = datetime.utcnow()
+                row.last_error = None
+            except Exception as e:
+                row.last_error = str(e)[:2000]
+                if row.attempts >= self.max_attempts:
+                    row.status = "dead"
+                    logger.error(f"[OutboxWorker] Dead-lettered {row.message_id} after {row.attempts} attempts: {e}")
+                else:
+                    row.status = "queued"
+                    row.next_attempt_at = datetime.utcnow() + timedelta(seconds=self._retry_delay(row.attempts))
+                    logger.warning(f"[OutboxWorker] Send failed for {row.message_id} (attempt {row.attempts}): {e}")
+        db.session.commit()
+        logger.info(f"[OutboxWorker] Processed {len(rows)} queued emails.")
+        return len(rows)
+
+    def run_forever(self) -> None:
+        logger.info("[OutboxWorker] Started.")
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    processed = self.run_once()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.exception(f"[OutboxWorker] Batch failed: {e}")
+                    processed = 0
+                finally:
+                    db.session.remove()
+            if processed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+        with self.app.app_context():
+            self.smtp.close()
+        logger.info("[OutboxWorker] Stopped.")
+
+    def start(self) -> "OutboxWorker":
+        self._thread = threading.Thread(target=self.run_forever, name="email-outbox", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
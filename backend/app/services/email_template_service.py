@@ -0,0 +1,421 @@
+import html
+import string
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+# -------------------------------------------------------------------
+# Static configuration (built once at import, not per message)
+# -------------------------------------------------------------------
+STATUS_CONFIGS = {
+    "Complete": {
+        "color": "#16a34a",
+        "bg_color": "#dcfce7",
+        "icon": "✅",
+        "message": (
+            "<strong>Report Complete:</strong> Your request has been processed successfully. "
+            "Your report is now available for download through the management system."
+        ),
+        "urgency": "high"
+    },
+    "Inprogress": {
+        "color": "#f59e0b",
+        "bg_color": "#fef3c7",
+        "icon": "⏳",
+        "message": (
+            "<strong>Processing:</strong> Your request is currently being processed by our team. "
+            "You will be notified as soon as your report is ready."
+        ),
+        "urgency": "medium"
+    },
+    "Unassigned": {
+        "color": "#6b7280",
+        "bg_color": "#f3f4f6",
+        "icon": "📋",
+        "message": (
+            "<strong>Received:</strong> Your request has been received and is awaiting assignment. "
+            "You will be updated once a team member is assigned."
+        ),
+        "urgency": "low"
+    },
+    "Rejected": {
+        "color": "#dc2626",
+        "bg_color": "#fee2e2",
+        "icon": "❌",
+        "message": (
+            "<strong>Request Rejected:</strong> Unfortunately, we were unable to process your request. "
+            "Please contact support for further assistance."
+        ),
+        "urgency": "high"
+    }
+}
+
+PRIORITY_INDICATORS = {
+    "high": '<span style="background:#dc2626;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">HIGH PRIORITY</span>',
+    "medium": '<span style="background:#f59e0b;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">MEDIUM PRIORITY</span>',
+    "low": '<span style="background:#6b7280;color:white;padding:2px 8px;border-radius:12px;font-size:11px;font-weight:600;">LOW PRIORITY</span>'
+}
+
+
+def status_config_for(status: str) -> dict:
+    return STATUS_CONFIGS.get(status, STATUS_CONFIGS["Unassigned"])
+
+
+def priority_indicator_for(urgency: str) -> str:
+    return PRIORITY_INDICATORS.get(urgency, PRIORITY_INDICATORS["low"])
+
+
+@lru_cache(maxsize=64)
+def timeline_html(status: str, assigned: bool) -> str:
+    """Progress timeline; it only depends on the status and whether someone is assigned."""
+    steps = [
+        ("Request Submitted", "✅" if status in ["Complete", "Inprogress", "Rejected"] else "⭕"),
+        ("Team Assigned", "✅" if assigned and status in ["Complete", "Inprogress"] else "⏳" if status == "Unassigned" else "❌"),
+        ("Report Processing", "✅" if status == "Complete" else "⏳" if status == "Inprogress" else "⭕"),
+        ("Report Complete", "✅" if status == "Complete" else "⭕")
+    ]
+
+    parts = ['<div style="margin:20px 0;"><h4 style="margin:0 0 10px 0;color:#374151;">Progress Timeline</h4>']
+    for i, (step_name, icon) in enumerate(steps):
+        connector = '<div style="width:2px;height:20px;background:#e5e7eb;margin-left:10px;"></div>' if i < len(steps) - 1 else ''
+        parts.append(f'''
+        <div style="display:flex;align-items:center;margin:5px 0;">
+            <span style="font-size:16px;margin-right:10px;">{icon}</span>
+            <span style="color:#374151;font-weight:500;">{step_name}</span>
+        </div>
+        {connector}
+        ''')
+    parts.append('</div>')
+    return "".join(parts)
+
+
+def greeting_for(hour: int) -> str:
+    if hour < 12:
+        return "Good morning"
+    elif hour < 17:
+        return "Good afternoon"
+    return "Good evening"
+
+
+# -------------------------------------------------------------------
+# Template compilation
+# -------------------------------------------------------------------
+class CompiledTemplate:
+    """A ``{field}`` template pre-split into literal text and field names.
+
+    ``bind`` folds known values into the literals ahead of time, so rendering
+    is a single join over the few fields that still vary per message.
+    """
+
+    def __init__(self, segments: List[tuple]):
+        self.segments = segments
+        self.fields = {field for _, field in segments if field}
+
+    @classmethod
+    def compile(cls, source: str) -> "CompiledTemplate":
+        return cls([(literal, field or None) for literal, field, _, _ in string.Formatter().parse(source)])
+
+    def bind(self, **values) -> "CompiledTemplate":
+        segments = []
+        pending = ""
+        for literal, field in self.segments:
+            pending += literal
+            if field is None:
+                continue
+            if field in values:
+                pending += str(values[field])
+            else:
+                segments.append((pending, field))
+                pending = ""
+        segments.append((pending, None))
+        return CompiledTemplate(segments)
+
+    def render(self, values: Dict) -> str:
+        parts = []
+        for literal, field in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values[field]))
+        return "".join(parts)
+
+
+ASSIGNMENT_TEMPLATE = CompiledTemplate.compile('''
+        <div style="background:#e0f2fe;border:1px solid #0288d1;border-radius:8px;padding:16px;margin:20px 0;">
+            <h4 style="margin:0 0 8px 0;color:#01579b;display:flex;align-items:center;">
+                <span style="margin-right:8px;">👤</span> Team Assignment
+            </h4>
+            <p style="margin:0;color:#0277bd;font-size:14px;">
+                Your request has been assigned to <strong>{assigned_to}</strong> from our expert team.
+            </p>
+        </div>
+        ''')
+
+DOWNLOAD_TEMPLATE = CompiledTemplate.compile('''
+        <div style="background:linear-gradient(135deg,#16a34a,#15803d);
+                    border-radius:10px;
+                    padding:20px;
+                    margin:25px 0;
+                    text-align:center;
+                    color:white;">
+            <h3 style="margin:0 0 10px 0;font-size:18px;">Report Ready for Download</h3>
+            <p style="margin:0 0 18px 0;opacity:0.95;">
+                Your <strong>{product}</strong> report is ready. Access the management system to download your report.
+            </p>
+            <div style="text-align:center;margin:20px 0;">
+                <a href="{report_link}" 
+                   style="display:inline-block;background:#16a34a;color:white;padding:12px 24px;text-decoration:none;border-radius:6px;font-weight:600;font-size:15px;">
+                    Access Report System
+                </a>
+            </div>
+        </div>
+        ''')
+
+REPORT_STATUS_TEMPLATE = CompiledTemplate.compile('''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Report Status Update - {request_id}</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin:0;padding:0;background-color:#f3f4f6;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,Arial,sans-serif;">
+    <div style="max-width:600px;margin:20px auto;background:#ffffff;border-radius:10px;overflow:hidden;box-shadow:0 7px 18px rgba(0,0,0,0.08);">
+        
+        <!-- Header -->
+        <div style="background:linear-gradient(135deg,#6366f1,#8b5cf6);padding:24px 16px;text-align:center;color:white;">
+            <h1 style="margin:0;font-size:22px;font-weight:600;">Report Management System</h1>
+            <p style="margin:7px 0 0 0;opacity:0.92;font-size:15px;">Status Update Notification</p>
+            <div style="margin-top:12px;">{priority_indicator}</div>
+        </div>
+        
+        <!-- Content -->
+        <div style="padding:24px 18px;">
+            <div style="margin-bottom:18px;">
+                <h2 style="margin:0 0 8px 0;color:#1e293b;font-size:18px;">{greeting},</h2>
+                <div style="background:{status_bg_color};
+                           border-left:4px solid {status_color};
+                           padding:12px 16px;
+                           border-radius:5px;
+                           margin:12px 0;">
+                    <div style="display:flex;align-items:center;margin-bottom:6px;">
+                        <span style="font-size:17px;margin-right:8px;">{status_icon}</span>
+                        <strong style="color:{status_color};font-size:15px;">Status Update</strong>
+                    </div>
+                    <p style="margin:0;color:#374151;line-height:1.5;">{status_message}</p>
+                </div>
+            </div>
+
+            <!-- Request Details -->
+            <h3 style="margin:16px 0 10px 0;color:#1e293b;font-size:16px;">Request Details</h3>
+            <table style="width:100%;border-collapse:collapse;margin:12px 0;border-radius:7px;overflow:hidden;box-shadow:0 1px 4px rgba(0,0,0,0.05);">
+                <tr>
+                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Request ID</td>
+                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;font-family:monospace;font-weight:500;">{request_id}</td>
+                </tr>
+                <tr>
+                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Product</td>
+                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">{product}</td>
+                </tr>
+                <tr>
+                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Category</td>
+                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">
+                        <span style="background:#e0e7ff;color:#3730a3;padding:3px 7px;border-radius:4px;font-size:12px;font-weight:500;">
+                            {category}
+                        </span>
+                    </td>
+                </tr>
+                <tr>
+                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Current Status</td>
+                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">
+                        <span style="display:inline-block;padding:5px 12px;border-radius:16px;color:white;background:{status_color};font-size:12px;font-weight:600;">
+                            {status_icon} {status_label}
+                        </span>
+                    </td>
+                </tr>
+                <tr>
+                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;border-bottom:1px solid #e2e8f0;">Report ID</td>
+                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;font-family:monospace;">{report_id}</td>
+                </tr>
+                <tr>
+                    <td style="padding:8px 12px;background:#f8fafc;font-weight:600;color:#374151;">Last Updated</td>
+                    <td style="padding:8px 12px;background:#ffffff;color:#1e293b;">{date_str}</td>
+                </tr>
+            </table>
+
+            {assignment_section}
+            {timeline_visual}
+            {download_section}
+            
+            <div style="margin-top:22px;padding-top:16px;border-top:1.5px solid #e2e8f0;">
+                <p style="color:#374151;line-height:1.5;font-size:14px;">
+                    Thank you for using our Report Management System. We'll keep you updated on any changes to your request.
+                </p>
+                <p style="margin-top:16px;color:#374151;font-size:14px;">
+                    Best regards,<br>
+                    <strong style="color:#6366f1;">The LKCentrix Team</strong>
+                </p>
+            </div>
+        </div>
+        
+        <!-- Footer -->
+        <div style="background:#f8fafc;padding:16px;text-align:center;border-top:1px solid #e2e8f0;">
+            <p style="margin:0 0 4px 0;font-size:13px;color:#6b7280;">
+                This is an automated notification from the Report Management System.
+            </p>
+            <p style="margin:0;font-size:12px;color:#9ca3af;">
+                © 2025 LKCentrix Report Management System. All rights reserved.
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+''')
+
+
+class ReportEmailRenderer:
+    """Renders report status emails from templates compiled once per status."""
+
+    def __init__(self):
+        self._by_status = {status: self._bind_status(status) for status in STATUS_CONFIGS}
+
+    @staticmethod
+    def _bind_status(status: str) -> CompiledTemplate:
+        config = status_config_for(status)
+        return REPORT_STATUS_TEMPLATE.bind(
+            priority_indicator=priority_indicator_for(config["urgency"]),
+            status_color=config["color"],
+            status_bg_color=config["bg_color"],
+            status_icon=config["icon"],
+            status_message=config["message"],
+        )
+
+    def _template_for(self, status: str) -> CompiledTemplate:
+        return self._by_status.get(status) or self._by_status["Unassigned"]
+
+    def render(self, data: Dict, now: datetime = None) -> str:
+        now = now or datetime.now()
+        return self._render(data, now.strftime("%B %d, %Y • %I:%M %p"), greeting_for(now.hour))
+
+    def render_batch(self, items: Iterable[Dict], now: datetime = None) -> List[str]:
+        """Render many messages, sharing the timestamp/greeting work across the batch."""
+        now = now or datetime.now()
+        date_str = now.strftime("%B %d, %Y • %I:%M %p")
+        greeting = greeting_for(now.hour)
+        return [self._render(data, date_str, greeting) for data in items]
+
+    def _render(self, data: Dict, date_str: str, greeting: str) -> str:
+        assigned_to = data.get("assignedTo")
+        assignment_section = ASSIGNMENT_TEMPLATE.render({"assigned_to": data["assignedTo"]}) if assigned_to else ""
+
+        download_section = ""
+        if data.get("status") == "Complete" and data.get("download"):
+            download_section = DOWNLOAD_TEMPLATE.render({
+                "product": data["product"],
+                "report_link": data.get("report_link", "#"),
+            })
+
+        return self._template_for(data["status"]).render({
+            "request_id": data["requestId"],
+            "greeting": greeting,
+            "product": data["product"],
+            "category": data["category"].upper(),
+            "status_label": data["status"].upper(),
+            "report_id": data.get("report") or "Pending",
+            "date_str": date_str,
+            "assignment_section": assignment_section,
+            "timeline_visual": timeline_html(data["status"], bool(data.get("assignedTo", ""))),
+            "download_section": download_section,
+        })
+
+
+report_email_renderer = ReportEmailRenderer()
+
+
+# -------------------------------------------------------------------
+# Price alerts
+# -------------------------------------------------------------------
+PRICE_ALERT_ROW_TEMPLATE = CompiledTemplate.compile('''
+                <tr>
+                    <td style="padding:10px 12px;background:#ffffff;color:#1e293b;border-bottom:1px solid #e2e8f0;">
+                        <a href="{link}" style="color:#1e293b;font-weight:600;text-decoration:none;">{title}</a>
+                        <div style="margin-top:4px;font-size:12px;color:#6b7280;">{merchant} &bull; {reason}</div>
+                    </td>
+                    <td style="padding:10px 12px;background:#ffffff;border-bottom:1px solid #e2e8f0;text-align:right;white-space:nowrap;">
+                        <strong style="color:#16a34a;font-size:15px;">{price}</strong>
+                        <div style="font-size:12px;color:#9ca3af;text-decoration:line-through;">{previous_price}</div>
+                    </td>
+                </tr>
+        ''')
+
+PRICE_ALERT_TEMPLATE = CompiledTemplate.compile('''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Price Alert</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin:0;padding:0;background-color:#f3f4f6;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,Arial,sans-serif;">
+    <div style="max-width:600px;margin:20px auto;background:#ffffff;border-radius:10px;overflow:hidden;box-shadow:0 7px 18px rgba(0,0,0,0.08);">
+
+        <!-- Header -->
+        <div style="background:linear-gradient(135deg,#16a34a,#15803d);padding:24px 16px;text-align:center;color:white;">
+            <h1 style="margin:0;font-size:22px;font-weight:600;">Price Alert</h1>
+            <p style="margin:7px 0 0 0;opacity:0.92;font-size:15px;">{summary}</p>
+        </div>
+
+        <!-- Content -->
+        <div style="padding:24px 18px;">
+            <h2 style="margin:0 0 8px 0;color:#1e293b;font-size:18px;">{greeting},</h2>
+            <p style="margin:0 0 12px 0;color:#374151;line-height:1.5;">
+                Prices you are watching have changed. Here are the offers that matched your alerts:
+            </p>
+            <table style="width:100%;border-collapse:collapse;margin:12px 0;border-radius:7px;overflow:hidden;box-shadow:0 1px 4px rgba(0,0,0,0.05);">
+                {rows}
+            </table>
+            <p style="margin-top:16px;color:#6b7280;font-size:13px;">Checked {date_str}. Prices may have changed since.</p>
+        </div>
+
+        <!-- Footer -->
+        <div style="background:#f8fafc;padding:16px;text-align:center;border-top:1px solid #e2e8f0;">
+            <p style="margin:0;font-size:13px;color:#6b7280;">
+                You are receiving this because you created a price alert. Delete the alert to stop these emails.
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+''')
+
+
+def format_price(price: Optional[float]) -> str:
+    return f"{price:,.2f}" if price is not None else ""
+
+
+class PriceAlertEmailRenderer:
+    """Renders one digest email for all alerts a recipient triggered in a batch."""
+
+    def subject(self, alerts: List[Dict]) -> str:
+        if len(alerts) == 1:
+            return f"Price alert: {(alerts[0]['title'] or 'Product')[:80]} is now {format_price(alerts[0]['price'])}"
+        return f"Price alerts: {len(alerts)} of your alerts were triggered"
+
+    def render(self, alerts: List[Dict], now: datetime = None) -> str:
+        now = now or datetime.now()
+        rows = "".join(PRICE_ALERT_ROW_TEMPLATE.render({
+            "link": html.escape(alert.get("link") or "#", quote=True),
+            "title": html.escape(alert["title"] or "Product"),
+            "merchant": html.escape(alert.get("merchant") or "Any merchant"),
+            "reason": html.escape(alert["reason"]),
+            "price": format_price(alert["price"]),
+            "previous_price": format_price(alert.get("previousPrice")),
+        }) for alert in alerts)
+        return PRICE_ALERT_TEMPLATE.render({
+            "summary": f"{len(alerts)} alert{'s' if len(alerts) != 1 else ''} triggered",
+            "greeting": greeting_for(now.hour),
+            "rows": rows,
+            "date_str": now.strftime("%B %d, %Y • %I:%M %p"),
+        })
+
+
+price_alert_email_renderer = PriceAlertEmailRenderer()
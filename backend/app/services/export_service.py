@@ -0,0 +1,183 @@
+import csv
+import gzip
+import io
+import logging
+from datetime import datetime
+from typing import Iterable, Iterator, List
+
+from .offers import Offer
+
+logger = logging.getLogger(__name__)
+
+# (column header, Offer attribute, parquet type) -- the order here is the file column order.
+EXPORT_COLUMNS = [
+    ("Title", "title", "string"),
+    ("Link", "link", "string"),
+    ("Extracted_Price", "price", "float"),
+    ("Original_Price", "original_price", "float"),
+    ("Savings", "savings", "float"),
+    ("Merchant", "merchant", "string"),
+    ("Rating", "rating", "float"),
+    ("Reviews", "reviews", "int"),
+    ("Thumbnail", "thumbnail", "string"),
+    ("Search_Query", "query", "string"),
+    ("Scraped_At", "scraped_at", "timestamp"),
+]
+EXPORT_HEADERS = [header for header, _, _ in EXPORT_COLUMNS]
+
+DEFAULT_CHUNK_SIZE = 1000
+PARQUET_COMPRESSIONS = ("snappy", "gzip", "zstd", "brotli", "none")
+
+
+def export_row(offer: Offer) -> List:
+    row = [getattr(offer, attribute) for _, attribute, _ in EXPORT_COLUMNS]
+    scraped_at = row[-1]
+    if isinstance(scraped_at, datetime):
+        row[-1] = scraped_at.isoformat()
+    return row
+
+
+def _chunked(items: Iterable[Offer], chunk_size: int) -> Iterator[List[Offer]]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(items: Iterable[Offer], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """Yield CSV text in chunks of ``chunk_size`` rows, header first.
+
+    Only one chunk of rows is ever held in memory, so ``items`` can be a
+    generator over an arbitrarily large result set.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADERS)
+    for chunk in _chunked(items, chunk_size):
+        writer.writerows(export_row(item) for item in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def write_csv(items: Iterable[Offer], path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              compression: str = None) -> int:
+    """Stream ``items`` to ``path`` and return the row count.
+
+    ``compression='gzip'`` (or a ``.gz`` path) gzips the output.
+    """
+    counter = [0]
+
+    def counted(source):
+        for item in source:
+            counter[0] += 1
+            yield item
+
+    opener = gzip.open if compression == "gzip" or path.endswith(".gz") else open
+    with opener(path, "wt", newline="", encoding="utf-8") as f:
+        for text in iter_csv(counted(items), chunk_size):
+            f.write(text)
+    return counter[0]
+
+
+# ---------------------------------------------------------------------------
+# Parquet (optional dependency: pyarrow)
+# ---------------------------------------------------------------------------
+def _coerce(value, kind: str):
+    if value is None or value == "":
+        return None
+    if kind == "timestamp":
+        return value if isinstance(value, datetime) else None
+    try:
+        if kind == "float":
+            return float(value)
+        if kind == "int":
+            return int(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+def _parquet_schema(pa):
+    types = {"string": pa.string(), "float": pa.float64(), "int": pa.int64(), "timestamp": pa.timestamp("us")}
+    return pa.schema([(header, types[kind]) for header, _, kind in EXPORT_COLUMNS])
+
+
+def _record_batch(pa, schema, chunk: List[Offer]):
+    columns = [
+        pa.array([_coerce(getattr(offer, attribute), kind) for offer in chunk], type=schema.field(header).type)
+        for header, attribute, kind in EXPORT_COLUMNS
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are drained after every row group."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _parquet_compression(compression: str):
+    if compression not in PARQUET_COMPRESSIONS:
+        raise ValueError(f"compression must be one of {', '.join(PARQUET_COMPRESSIONS)}")
+    return None if compression == "none" else compression
+
+
+def iter_parquet(items: Iterable[Offer], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 compression: str = "snappy") -> Iterator[bytes]:
+    """Yield a Parquet file as byte chunks, one row group per ``chunk_size`` items."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=_parquet_compression(compression))
+    try:
+        for chunk in _chunked(items, chunk_size):
+            writer.write_batch(_record_batch(pa, schema, chunk))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def write_parquet(items: Iterable[Offer], path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  compression: str = "snappy") -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa)
+    written = 0
+    with pq.ParquetWriter(path, schema, compression=_parquet_compression(compression)) as writer:
+        for chunk in _chunked(items, chunk_size):
+            writer.write_batch(_record_batch(pa, schema, chunk))
+            written += len(chunk)
+    return written
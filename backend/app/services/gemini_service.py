@@ -1,32 +1,105 @@
 import requests
 import json
 import logging
+import random
+import time
+from flask import current_app
+from requests.adapters import HTTPAdapter
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.inflight import inflight
+from app.utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Upstream statuses worth retrying: rate limiting and transient server errors.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 class GeminiService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, connect_timeout: float = 5.0, read_timeout: float = 60.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 pool_size: int = 10, breaker: CircuitBreaker = None):
         self.api_key = api_key
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+        self.model_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash"
+        self.base_url = f"{self.model_url}:generateContent"
+        self.stream_url = f"{self.model_url}:streamGenerateContent"
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        # One pooled keep-alive session per service instance, so chat turns
+        # reuse the TLS connection instead of handshaking on every request.
+        self.session = requests.Session()
+        self.session.headers.update({'Content-Type': 'application/json'})
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0))
         logger.info("[GeminiService] Initialized.")
 
+    def _backoff_delay(self, attempt: int, retry_after: str = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # "Full jitter" exponential backoff.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, url: str, payload: dict, stream: bool = False) -> requests.Response:
+        """POST with timeouts, jittered retries on 429/5xx and the circuit breaker."""
+        if not self.breaker.allow():
+            metrics.incr("gemini.circuit_rejected")
+            raise CircuitOpenError("Gemini API is unavailable (circuit open); try again shortly.")
+
+        for attempt in range(self.max_retries + 1):
+            start = time.monotonic()
+            try:
+                with inflight.track("gemini"):
+                    response = self.session.post(url, data=json.dumps(payload), timeout=self.timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                metrics.observe("gemini.request", time.monotonic() - start, error=True)
+                if attempt < self.max_retries:
+                    delay = self._backoff_delay(attempt)
+                    logger.warning(f"[GeminiService] {type(e).__name__} on attempt {attempt + 1}; retrying in {delay:.2f}s")
+                    metrics.incr("gemini.retries")
+                    time.sleep(delay)
+                    continue
+                self.breaker.record_failure()
+                raise
+            except Exception:
+                # Any other error (ChunkedEncodingError, TooManyRedirects, ...) still
+                # counts, so a half-open breaker always gets its trial's outcome.
+                metrics.observe("gemini.request", time.monotonic() - start, error=True)
+                self.breaker.record_failure()
+                raise
+
+            failed = response.status_code in RETRY_STATUSES
+            metrics.observe("gemini.request", time.monotonic() - start, error=failed)
+            if failed and attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"[GeminiService] HTTP {response.status_code} on attempt {attempt + 1}; retrying in {delay:.2f}s")
+                metrics.incr("gemini.retries")
+                response.close()
+                time.sleep(delay)
+                continue
+
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            return response
+
     def generate_text(self, chat_history: list) -> str:
-        headers = {
-            'Content-Type': 'application/json'
-        }
         payload = {
             "contents": chat_history,
         }
-        
+
         api_url = f"{self.base_url}?key={self.api_key}"
+        response = None
 
         try:
             logger.info(f"[GeminiService] Sending request to Gemini API. History length: {len(chat_history)}")
-            response = requests.post(api_url, headers=headers, data=json.dumps(payload))
+            response = self._post(api_url, payload)
             response.raise_for_status()
-            
+
             result = response.json()
-            
+
             if result.get("candidates") and len(result["candidates"]) > 0 and \
                result["candidates"][0].get("content") and \
                result["candidates"][0]["content"].get("parts") and \
@@ -50,9 +123,76 @@ class GeminiService:
         except requests.exceptions.RequestException as req_err:
             logger.error(f"[GeminiService] An error occurred during Gemini API request: {req_err}")
             raise Exception(f"Error calling Gemini API: {req_err}")
+        except CircuitOpenError as breaker_err:
+            logger.error(f"[GeminiService] {breaker_err}")
+            raise Exception(str(breaker_err))
         except json.JSONDecodeError as json_err:
             logger.error(f"[GeminiService] JSON decode error: {json_err} - Response: {response.text}")
             raise Exception(f"Invalid JSON response from Gemini API: {response.text}")
         except Exception as e:
             logger.error(f"[GeminiService] An unexpected error occurred: {e}")
-            raise Exception(f"An unexpected error occurred: {e}")
\ No newline at end of file
+            raise Exception(f"An unexpected error occurred: {e}")
+
+    def stream_text(self, chat_history: list):
+        """Yield text fragments as Gemini generates them (SSE ``streamGenerateContent``).
+
+        Closing the generator (e.g. when the client disconnects) closes the
+        upstream response, which cancels generation on Google's side.
+        """
+        payload = {
+            "contents": chat_history,
+        }
+        api_url = f"{self.stream_url}?alt=sse&key={self.api_key}"
+
+        logger.info(f"[GeminiService] Opening stream to Gemini API. History length: {len(chat_history)}")
+        try:
+            response = self._post(api_url, payload, stream=True)
+        except CircuitOpenError as breaker_err:
+            raise Exception(str(breaker_err))
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"[GeminiService] Stream request failed: {req_err}")
+            raise Exception(f"Error calling Gemini API: {req_err}")
+
+        start = time.monotonic()
+        first_chunk = True
+        # The request stays in flight until the stream is consumed or closed.
+        inflight.begin("gemini_stream")
+        try:
+            if response.status_code >= 400:
+                logger.error(f"[GeminiService] HTTP error on stream: {response.status_code} - {response.text}")
+                raise Exception(f"Gemini API HTTP error: {response.text}")
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                chunk = json.loads(line[len("data:"):].strip())
+                for candidate in chunk.get("candidates", [])[:1]:
+                    for part in candidate.get("content", {}).get("parts", []):
+                        text = part.get("text")
+                        if text:
+                            if first_chunk:
+                                metrics.observe("gemini.time_to_first_token", time.monotonic() - start)
+                                first_chunk = False
+                            yield text
+            logger.info("[GeminiService] Stream from Gemini API completed.")
+        finally:
+            response.close()
+            inflight.end("gemini_stream")
+
+
+def get_gemini_service() -> GeminiService:
+    """Process-wide GeminiService for the current app, built on first use."""
+    service = current_app.extensions.get("gemini_service")
+    if service is None:
+        config = current_app.config
+        service = GeminiService(
+            config["GEMINI_API_KEY"],
+            connect_timeout=config["GEMINI_CONNECT_TIMEOUT"],
+            read_timeout=config["GEMINI_READ_TIMEOUT"],
+            max_retries=config["GEMINI_MAX_RETRIES"],
+            pool_size=config["GEMINI_POOL_SIZE"],
+            breaker=CircuitBreaker(config["GEMINI_BREAKER_THRESHOLD"], config["GEMINI_BREAKER_RESET"]),
+        )
+        # setdefault keeps a single instance if two threads race on first use.
+        service = current_app.extensions.setdefault("gemini_service", service)
+    return service
@@ -1,102 +1,134 @@
-import pandas as pd
+import logging
 from datetime import datetime
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict
 from .serp_service import SerpService
+from .query_executor import QueryOutcome, iter_outcomes, run_queries
+from .export_service import write_csv, write_parquet
+from .offers import Offer, parse_offers
+
+logger = logging.getLogger(__name__)
 
 class GooglePriceMonitorService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, history_store=None, product_index=None, alert_engine=None):
         self.serp_service = SerpService(api_key)
-        self.price_history = []
+        # Optional PriceHistoryStore; when set, monitored items are persisted.
+        self.history_store = history_store
+        # Optional ProductIndex; when set, offers get canonical cross-merchant product keys.
+        self.product_index = product_index
+        # Optional PriceAlertEngine; when set, fresh observations are checked against alert rules.
+        self.alert_engine = alert_engine
     
+    def _query_runner(self, price_range: tuple = None):
+        def run(query: str, query_timeout: float) -> List[Offer]:
+            results = self.serp_service.search_google(query, timeout=query_timeout)
+            return self._match(parse_offers(results.get('shopping_results', []), query, price_range=price_range))
+        return run
+
+    def monitor_queries(self, product_queries: List[str], price_range: tuple = None, max_workers: int = 1,
+                        rate_limit: float = None, timeout: float = None) -> List[QueryOutcome]:
+        """Search every query and return one ``QueryOutcome`` per query, in input order.
+
+        With ``max_workers > 1`` queries run on a bounded thread pool; ``rate_limit``
+        caps SerpAPI calls per second and ``timeout`` bounds each query in seconds.
+        """
+        return run_queries(self._query_runner(price_range), list(product_queries), max_workers=max_workers,
+                           rate_limit=rate_limit, timeout=timeout)
+
+    def iter_monitor_queries(self, product_queries: List[str], price_range: tuple = None, max_workers: int = 1,
+                             rate_limit: float = None, timeout: float = None) -> Iterator[QueryOutcome]:
+        """``monitor_queries`` yielding each outcome as it completes, for streaming consumers."""
+        return iter_outcomes(self._query_runner(price_range), list(product_queries), max_workers=max_workers,
+                             rate_limit=rate_limit, timeout=timeout)
+
     def monitor_search_results(self, product_queries: List[str], 
-                               price_range: tuple = None) -> List[Dict]:
+                               price_range: tuple = None, max_workers: int = 1,
+                               rate_limit: float = None, timeout: float = None) -> List[Offer]:
         all_results = []
-        
-        for query in product_queries:
-            try:
-                results = self.serp_service.search_google(query)
-                
-                shopping_results = results.get('shopping_results', []) 
-                
-                if price_range:
-                    min_price, max_price = price_range
-                    shopping_results = [
-                        p for p in shopping_results
-                        if p.get('extracted_price') and 
-                        min_price <= p['extracted_price'] <= max_price
-                    ]
-                
-                for item in shopping_results: 
-                    item['search_query'] = query
-                    item['scraped_at'] = datetime.now().isoformat()
-                
-                all_results.extend(shopping_results) 
-                
-            except Exception as e:
-                print(f"Error monitoring results for '{query}': {e}") # Keep message general for monitoring
-        
+
+        for outcome in self.monitor_queries(product_queries, price_range, max_workers, rate_limit, timeout):
+            if outcome.ok:
+                all_results.extend(outcome.results)
+            else:
+                logger.warning(f"[GooglePriceMonitorService] Error monitoring results for '{outcome.query}': {outcome.error}")
+
+        if self.history_store is not None and all_results:
+            self.history_store.record_observations(all_results)
+        self.check_alerts(all_results)
+
         return all_results
-    
+
     def get_search_result_comparison(self, query: str, min_price: float = None, 
                                      max_price: float = None) -> Dict:
         try:
             results = self.serp_service.search_google(query)
-            
             items = results.get('shopping_results', []) 
-            
-            valid_items = [
-                item for item in items 
-                if item.get('extracted_price') is not None
-            ]
-            
-            if not valid_items:
-                return {"error": "No products with valid prices found from Google Shopping."} # CHANGED message
-            
-            prices = [p['extracted_price'] for p in valid_items]
-            
-            if not prices: 
-                return {"error": "No valid numerical prices could be extracted from results after filtering."}
 
+            if not any(item.get('extracted_price') is not None for item in items):
+                return {"error": "No products with valid prices found from Google Shopping."} # CHANGED message
 
-            if min_price is not None:
-                valid_items = [p for p in valid_items if p['extracted_price'] >= min_price]
-            if max_price is not None:
-                valid_items = [p for p in valid_items if p['extracted_price'] <= max_price]
-            
-            return {
-                "items": valid_items, 
-                "price_stats": {
-                    "min_price": min(prices) if prices else "N/A",
-                    "max_price": max(prices) if prices else "N/A",
-                    "avg_price": sum(prices) / len(prices) if prices else "N/A",
-                    "total_items_with_price": len(valid_items)
-                }
-            }
+            # numpy is only imported once a comparison is actually requested.
+            from .price_analytics import analyze_items
+            return self._comparison(analyze_items(self._match(parse_offers(items, query)), min_price, max_price))
             
         except Exception as e:
             return {"error": f"Google Shopping comparison failed: {str(e)}"} 
+
+    def compare_queries(self, queries: List[str], min_price: float = None, max_price: float = None,
+                        max_workers: int = 1, rate_limit: float = None, timeout: float = None) -> Dict[str, Dict]:
+        """``get_search_result_comparison`` for many queries, analysed together in one pass."""
+        outcomes = self.monitor_queries(queries, max_workers=max_workers, rate_limit=rate_limit, timeout=timeout)
+        ok = [outcome for outcome in outcomes if outcome.ok]
+
+        from .price_analytics import analyze_result_sets
+        analyses = analyze_result_sets([outcome.results for outcome in ok], min_price, max_price)
+
+        analysis_of = dict(zip((outcome.query for outcome in ok), analyses))
+        return {
+            outcome.query: self._comparison(analysis_of[outcome.query]) if outcome.ok
+            else {"error": f"Google Shopping comparison failed: {outcome.error}"}
+            for outcome in outcomes
+        }
+
+    def check_alerts(self, offers: List[Offer], commit: bool = True) -> int:
+        """Evaluate alert rules for monitored ``offers``; returns the number of alerts triggered."""
+        if self.alert_engine is None or not offers:
+            return 0
+        return self.alert_engine.evaluate(offers, commit=commit)
+
+    def _match(self, offers: List[Offer]) -> List[Offer]:
+        if self.product_index is not None and offers:
+            self.product_index.assign(offers)
+        return offers
+
+    @staticmethod
+    def _comparison(analysis: Dict) -> Dict:
+        stats = analysis["stats"]
+        return {
+            "items": analysis["items"],
+            "price_stats": {
+                "min_price": stats["min"] if stats["count"] else "N/A",
+                "max_price": stats["max"] if stats["count"] else "N/A",
+                "avg_price": stats["mean"] if stats["count"] else "N/A",
+                "median_price": stats["median"] if stats["count"] else "N/A",
+                "percentiles": stats["percentiles"],
+                "outlier_count": analysis["outliers"],
+                "total_items_with_price": stats["count"]
+            },
+            "merchants": analysis["merchants"],
+            "products": analysis["products"],
+        }
     
-    def export_to_csv(self, results_data: List[Dict], filename: str = None) -> str:
+    def export_to_csv(self, results_data: Iterable[Offer], filename: str = None, compression: str = None) -> str:
         if not filename:
             filename = f"google_shopping_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        csv_data = []
-        for item in results_data:
-            csv_row = {
-                'Title': item.get('title'),
-                'Link': item.get('link'),
-                'Extracted_Price': item.get('extracted_price'),
-                'Original_Price': item.get('original_price'), 
-                'Savings': item.get('savings'),             
-                'Merchant': item.get('merchant'),           
-                'Rating': item.get('rating'),               
-                'Reviews': item.get('reviews'),             
-                'Thumbnail': item.get('thumbnail'),         
-                'Search_Query': item.get('search_query'),
-                'Scraped_At': item.get('scraped_at')
-            }
-            csv_data.append(csv_row)
-        
-        df = pd.DataFrame(csv_data)
-        df.to_csv(filename, index=False)
-        return filename
\ No newline at end of file
+
+        write_csv(results_data, filename, compression=compression)
+        return filename
+
+    def export_to_parquet(self, results_data: Iterable[Offer], filename: str = None,
+                          compression: str = "snappy") -> str:
+        if not filename:
+            filename = f"google_shopping_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
+
+        write_parquet(results_data, filename, compression=compression)
+        return filename
@@ -0,0 +1,140 @@
+import hashlib
+import math
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def normalize_title(title: str) -> str:
+    return " ".join((title or "").lower().split())
+
+
+def product_key_for(item: Dict) -> str:
+    """Stable product identifier: SerpAPI's product_id, else a hash of the normalized title."""
+    product_id = item.get("product_id")
+    if product_id:
+        return str(product_id)[:64]
+    return "t-" + hashlib.sha1(normalize_title(item.get("title")).encode("utf-8")).hexdigest()[:20]
+
+
+def price_range_error(price_range) -> Optional[str]:
+    """Validate a ``priceRange`` request value; returns an error message or None.
+
+    Accepts ``null`` or ``[min, max]`` where either end may be ``null`` for an
+    open range.
+    """
+    if price_range is None:
+        return None
+    if not isinstance(price_range, list) or len(price_range) != 2:
+        return "priceRange must be [min, max] or null"
+    for bound in price_range:
+        if bound is not None and (isinstance(bound, bool) or not isinstance(bound, (int, float))
+                                  or not math.isfinite(bound)):
+            return "priceRange bounds must be numbers or null"
+    if None not in price_range and price_range[0] > price_range[1]:
+        return "priceRange min must not exceed max"
+    return None
+
+
+def price_range_bounds(price_min: Optional[float], price_max: Optional[float]) -> Optional[Tuple[float, float]]:
+    """``(min, max)`` for ``parse_offers`` with open ends as infinities, or None when unbounded."""
+    if price_min is None and price_max is None:
+        return None
+    return (price_min if price_min is not None else float("-inf"),
+            price_max if price_max is not None else float("inf"))
+
+
+class Offer:
+    """One shopping offer, reduced to the fields the monitor, exports and history use.
+
+    SerpAPI items carry dozens of keys; an ``Offer`` keeps only these slots,
+    so large monitoring sweeps hold a fraction of the memory of raw dicts.
+    """
+
+    __slots__ = ("title", "link", "price", "original_price", "merchant", "rating", "reviews",
+                 "thumbnail", "query", "scraped_at", "product_id", "product_key")
+
+    def __init__(self, title: str, link: str = None, price: float = None, original_price: float = None,
+                 merchant: str = "", rating: float = None, reviews: int = None, thumbnail: str = None,
+                 query: str = None, scraped_at: datetime = None, product_id: str = None, product_key: str = None):
+        self.title = title
+        self.link = link
+        self.price = price
+        self.original_price = original_price
+        self.merchant = merchant
+        self.rating = rating
+        self.reviews = reviews
+        self.thumbnail = thumbnail
+        self.query = query
+        self.scraped_at = scraped_at
+        self.product_id = product_id
+        self.product_key = product_key
+
+    @property
+    def savings(self) -> Optional[float]:
+        if self.price is None or self.original_price is None:
+            return None
+        return round(self.original_price - self.price, 2)
+
+    def to_dict(self) -> Dict:
+        """JSON form, using the SerpAPI key names the frontend already reads."""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "extracted_price": self.price,
+            "extracted_old_price": self.original_price,
+            "source": self.merchant,
+            "rating": self.rating,
+            "reviews": self.reviews,
+            "thumbnail": self.thumbnail,
+            "product_id": self.product_id,
+            "product_key": self.product_key,
+            "search_query": self.query,
+            "scraped_at": self.scraped_at.isoformat() if self.scraped_at else None,
+        }
+
+    def __repr__(self) -> str:
+        return f"Offer({self.title!r}, price={self.price!r}, merchant={self.merchant!r})"
+
+
+def _number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def parse_offers(shopping_results: Iterable[Dict], query: str = None, scraped_at: datetime = None,
+                 price_range: Tuple[float, float] = None) -> List[Offer]:
+    """Build ``Offer`` records from SerpAPI ``shopping_results``.
+
+    ``price_range`` drops items without a price or outside ``(min, max)``.
+    All offers from one payload share the same ``scraped_at`` (UTC, like every
+    other stored timestamp).
+    """
+    scraped_at = scraped_at or datetime.utcnow()
+    min_price, max_price = price_range if price_range else (None, None)
+    offers = []
+    append = offers.append
+    for item in shopping_results:
+        price = _number(item.get("extracted_price"))
+        if price_range and (price is None or not min_price <= price <= max_price):
+            continue
+        product_id = item.get("product_id")
+        append(Offer(
+            item.get("title") or "",
+            item.get("link") or item.get("product_link"),
+            price,
+            _number(item.get("extracted_old_price")),
+            item.get("source") or item.get("merchant") or "",
+            _number(item.get("rating")),
+            _number(item.get("reviews")),
+            item.get("thumbnail"),
+            query,
+            scraped_at,
+            str(product_id) if product_id else None,
+            product_key_for(item),
+        ))
+    return offers
+
+
+def offers_to_dicts(offers: Iterable[Offer]) -> List[Dict]:
+    return [offer.to_dict() for offer in offers]
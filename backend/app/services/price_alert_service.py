@@ -0,0 +1,154 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+
+from app.models.alert_model import PriceAlertRule
+from app.models.db import db
+from app.utils.metrics import metrics
+from .email_outbox_service import enqueue_email
+from .email_template_service import format_price, price_alert_email_renderer
+from .offers import Offer
+
+logger = logging.getLogger(__name__)
+
+# Merchant-agnostic rules are keyed with an empty merchant.
+ANY_MERCHANT = ""
+
+
+def merchant_key(merchant: Optional[str]) -> str:
+    return (merchant or "").strip().lower()
+
+
+def best_offers(offers: Iterable[Offer]) -> Dict[Tuple[str, str], Offer]:
+    """Cheapest offer per ``(product_key, merchant)`` and per ``(product_key, ANY_MERCHANT)``.
+
+    Each rule sees one observation per batch: the best price at its merchant,
+    or across all merchants when it is not tied to one.
+    """
+    best = {}
+    for offer in offers:
+        if offer.price is None or not offer.product_key:
+            continue
+        for key in ((offer.product_key, merchant_key(offer.merchant)), (offer.product_key, ANY_MERCHANT)):
+            current = best.get(key)
+            if current is None or offer.price < current.price:
+                best[key] = offer
+    return best
+
+
+def evaluate_rule(rule: PriceAlertRule, price: float) -> Optional[str]:
+    """Advance ``rule``'s state with a new ``price``; returns the alert reason if it fires.
+
+    - ``below`` fires when the price crosses to at or under ``threshold``.
+    - ``drop_percent`` fires when the price is ``threshold`` percent under the
+      highest price seen since the rule last fired.
+    - ``new_low`` fires when the price undercuts every price seen before.
+    """
+    reason = None
+    if rule.rule_type == "below":
+        if price <= rule.threshold and (rule.last_price is None or rule.last_price > rule.threshold):
+            reason = f"Now at or below your target of {format_price(rule.threshold)}"
+    elif rule.rule_type == "drop_percent":
+        reference = rule.reference_price
+        if reference is not None and price <= reference * (1 - rule.threshold / 100.0):
+            reason = f"Dropped {round((1 - price / reference) * 100, 1)}% from {format_price(reference)}"
+            rule.reference_price = price
+        elif reference is None or price > reference:
+            rule.reference_price = price
+    elif rule.rule_type == "new_low":
+        if rule.lowest_price is not None and price < rule.lowest_price:
+            reason = f"New lowest price (previous low {format_price(rule.lowest_price)})"
+    if rule.lowest_price is None or price < rule.lowest_price:
+        rule.lowest_price = price
+    return reason
+
+
+class PriceAlertEngine:
+    """Evaluates price alert rules incrementally against fresh observations.
+
+    Only the active rules of products present in a batch are loaded (found
+    with an indexed ``product_key IN (...)`` query, then locked in id order),
+    each rule is checked
+    against the single best offer for its product/merchant, and the rule's
+    state is updated in place. Triggered alerts are grouped per recipient
+    into one email and queued in the outbox in the same transaction.
+    """
+
+    def __init__(self, chunk_size: int = 500):
+        self.chunk_size = chunk_size
+
+    def _rules_for(self, product_keys: List[str]) -> List[PriceAlertRule]:
+        rule_ids = []
+        for start in range(0, len(product_keys), self.chunk_size):
+            chunk = product_keys[start:start + self.chunk_size]
+            rule_ids.extend(
+                rule_id for rule_id, in db.session.query(PriceAlertRule.id)
+                .filter(PriceAlertRule.product_key.in_(chunk), PriceAlertRule.is_active.is_(True))
+            )
+        rule_ids.sort()
+
+        rules = []
+        for start in range(0, len(rule_ids), self.chunk_size):
+            rules.extend(
+                PriceAlertRule.query
+                .filter(PriceAlertRule.id.in_(rule_ids[start:start + self.chunk_size]),
+                        PriceAlertRule.is_active.is_(True))
+                # Serializes concurrent evaluation of the same rules (API and scheduler);
+                # locking in id order keeps overlapping evaluations from deadlocking.
+                .order_by(PriceAlertRule.id)
+                .with_for_update()
+                .all()
+            )
+        return rules
+
+    def evaluate(self, offers: Iterable[Offer], commit: bool = True) -> int:
+        """Check ``offers`` against their products' rules; returns the number of alerts triggered."""
+        best = best_offers(offers)
+        if not best:
+            return 0
+
+        rules = self._rules_for(sorted({product_key for product_key, _ in best}))
+        now = datetime.utcnow()
+        alerts_by_email = {}
+        for rule in rules:
+            offer = best.get((rule.product_key, merchant_key(rule.merchant)))
+            if offer is None:
+                continue
+            previous_price = rule.last_price
+            reason = evaluate_rule(rule, offer.price)
+            rule.last_price = offer.price
+            rule.last_observed_at = now
+            if reason is None:
+                continue
+            rule.last_triggered_at = now
+            rule.trigger_count = (rule.trigger_count or 0) + 1
+            alerts_by_email.setdefault(rule.email, []).append({
+                "ruleId": rule.id,
+                "title": offer.title or rule.product_title,
+                "merchant": offer.merchant,
+                "price": offer.price,
+                "previousPrice": previous_price,
+                "reason": reason,
+                "link": offer.link,
+            })
+
+        for email, alerts in alerts_by_email.items():
+            enqueue_email(email, price_alert_email_renderer.subject(alerts),
+                          price_alert_email_renderer.render(alerts), commit=False)
+        if commit:
+            db.session.commit()
+
+        triggered = sum(len(alerts) for alerts in alerts_by_email.values())
+        if triggered:
+            metrics.incr("alerts.triggered", triggered)
+            logger.info(f"[PriceAlertEngine] {triggered} alerts triggered for {len(alerts_by_email)} recipients.")
+        return triggered
+
+
+def get_alert_engine() -> Optional[PriceAlertEngine]:
+    """Process-wide PriceAlertEngine for the current app (None when alerts are disabled)."""
+    if not current_app.config["PRICE_ALERTS_ENABLED"]:
+        return None
+    return current_app.extensions.setdefault("price_alert_engine", PriceAlertEngine())
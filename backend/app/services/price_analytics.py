@@ -0,0 +1,178 @@
+"""Vectorized price statistics over shopping offers.
+
+Prices from one or many result sets are loaded into a single NumPy array
+with a parallel group index (result set, merchant or product). Every statistic is
+then computed for all groups at once from one sort, so comparing hundreds
+of queries costs the same handful of array operations as comparing one.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .offers import Offer
+
+DEFAULT_PERCENTILES = (25, 50, 75, 90)
+IQR_FACTOR = 1.5
+
+
+def extract_prices(offers: Sequence[Offer]) -> Tuple[np.ndarray, np.ndarray]:
+    """``(prices, positions)`` for offers that have a price."""
+    prices = np.fromiter((np.nan if offer.price is None else offer.price for offer in offers),
+                         dtype=np.float64, count=len(offers))
+    valid = ~np.isnan(prices)
+    return prices[valid], np.flatnonzero(valid)
+
+
+def price_mask(prices: np.ndarray, min_price: float = None, max_price: float = None) -> np.ndarray:
+    mask = ~np.isnan(prices)
+    if min_price is not None:
+        mask &= prices >= min_price
+    if max_price is not None:
+        mask &= prices <= max_price
+    return mask
+
+
+def grouped_stats(values: np.ndarray, groups: np.ndarray, n_groups: int,
+                  percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, np.ndarray]:
+    """Count/min/max/mean/median/percentiles per group, from a single lexsort.
+
+    Percentiles use linear interpolation (NumPy's default method). Empty
+    groups get NaN statistics and a count of 0.
+    """
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    nonempty = counts > 0
+    last = np.maximum(counts - 1, 0)
+
+    def quantile(q: float) -> np.ndarray:
+        position = starts + last * q
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        result = np.full(n_groups, np.nan)
+        lo, hi, pos = lower[nonempty], upper[nonempty], position[nonempty]
+        result[nonempty] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+        return result
+
+    sums = np.bincount(groups, weights=values, minlength=n_groups)
+    minimum = np.full(n_groups, np.nan)
+    maximum = np.full(n_groups, np.nan)
+    minimum[nonempty] = ordered[starts[nonempty]]
+    maximum[nonempty] = ordered[(starts + last)[nonempty]]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(nonempty, sums / counts, np.nan)
+
+    stats = {
+        "count": counts,
+        "min": minimum,
+        "max": maximum,
+        "mean": mean,
+        "median": quantile(0.5),
+        "q1": quantile(0.25),
+        "q3": quantile(0.75),
+    }
+    for p in percentiles:
+        stats[f"p{p:g}"] = quantile(p / 100.0)
+    return stats
+
+
+def iqr_outliers(values: np.ndarray, groups: np.ndarray, q1: np.ndarray, q3: np.ndarray,
+                 factor: float = IQR_FACTOR) -> np.ndarray:
+    """Boolean mask of values outside ``[q1 - factor*IQR, q3 + factor*IQR]`` of their group."""
+    iqr = q3 - q1
+    return (values < (q1 - factor * iqr)[groups]) | (values > (q3 + factor * iqr)[groups])
+
+
+def _number(value):
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _summary(stats: Dict[str, np.ndarray], index: int, percentiles: Iterable[float]) -> Dict:
+    return {
+        "count": int(stats["count"][index]),
+        "min": _number(stats["min"][index]),
+        "max": _number(stats["max"][index]),
+        "mean": _number(stats["mean"][index]),
+        "median": _number(stats["median"][index]),
+        "percentiles": {f"p{p:g}": _number(stats[f"p{p:g}"][index]) for p in percentiles},
+    }
+
+
+def _per_set_groups(prices: np.ndarray, sets: np.ndarray, labels: List[str]):
+    """Stats per (result set, label) pair: ``(pair_sets, pair_labels, first_position, stats)``."""
+    names, codes = np.unique(np.array(labels, dtype=str), return_inverse=True)
+    pairs, first, pair_index = np.unique(sets * len(names) + codes.reshape(-1), return_index=True, return_inverse=True)
+    stats = grouped_stats(prices, pair_index.reshape(-1), len(pairs), ())
+    return pairs // len(names), names[pairs % len(names)], first, stats
+
+
+def _group_summary(stats: Dict[str, np.ndarray], index: int) -> Dict:
+    summary = _summary(stats, index, ())
+    del summary["percentiles"]
+    return summary
+
+
+def analyze_result_sets(result_sets: Sequence[Sequence[Offer]], min_price: float = None, max_price: float = None,
+                        percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+                        per_merchant: bool = True, per_product: bool = True) -> List[Dict]:
+    """Filtered price statistics for each result set, computed in one vectorized pass.
+
+    Returns one dict per input set, in order, with the filtered ``items``
+    (``Offer.to_dict()`` plus an ``is_price_outlier`` flag), ``stats``, the number of
+    IQR ``outliers`` and, optionally, per-``merchants`` and per-``products``
+    aggregates (products being offers sharing a ``product_key``).
+    """
+    percentiles = tuple(percentiles)
+    flat_offers, price_chunks, group_chunks = [], [], []
+    for set_index, offers in enumerate(result_sets):
+        prices, positions = extract_prices(offers)
+        flat_offers.extend(offers[i] for i in positions)
+        price_chunks.append(prices)
+        group_chunks.append(np.full(len(prices), set_index, dtype=np.int64))
+
+    n_sets = len(result_sets)
+    prices = np.concatenate(price_chunks) if price_chunks else np.empty(0)
+    sets = np.concatenate(group_chunks) if group_chunks else np.empty(0, dtype=np.int64)
+
+    keep = np.flatnonzero(price_mask(prices, min_price, max_price))
+    prices, sets = prices[keep], sets[keep]
+    set_stats = grouped_stats(prices, sets, n_sets, percentiles)
+    outliers = iqr_outliers(prices, sets, set_stats["q1"], set_stats["q3"])
+    kept_offers = [flat_offers[i] for i in keep.tolist()]
+
+    analyses = [{"items": [], "stats": _summary(set_stats, i, percentiles), "outliers": 0,
+                 "merchants": [], "products": []}
+                for i in range(n_sets)]
+    for offer, set_index, is_outlier in zip(kept_offers, sets.tolist(), outliers.tolist()):
+        analyses[set_index]["items"].append(dict(offer.to_dict(), is_price_outlier=is_outlier))
+        analyses[set_index]["outliers"] += is_outlier
+
+    if per_merchant and kept_offers:
+        pair_sets, merchants, _, stats = _per_set_groups(prices, sets, [offer.merchant or "" for offer in kept_offers])
+        for index, (set_index, merchant) in enumerate(zip(pair_sets.tolist(), merchants.tolist())):
+            analyses[set_index]["merchants"].append(dict(_group_summary(stats, index), merchant=merchant))
+        for analysis in analyses:
+            analysis["merchants"].sort(key=lambda m: (m["min"], m["merchant"]))
+
+    if per_product and kept_offers:
+        pair_sets, keys, first, stats = _per_set_groups(prices, sets, [offer.product_key or "" for offer in kept_offers])
+        merchant_counts = {}
+        for offer, set_index in zip(kept_offers, sets.tolist()):
+            merchant_counts.setdefault((set_index, offer.product_key or ""), set()).add(offer.merchant)
+        for index, (set_index, key) in enumerate(zip(pair_sets.tolist(), keys.tolist())):
+            analyses[set_index]["products"].append(dict(
+                _group_summary(stats, index),
+                product_key=key,
+                title=kept_offers[first[index]].title,
+                merchants=len(merchant_counts[(set_index, key)]),
+            ))
+        for analysis in analyses:
+            analysis["products"].sort(key=lambda p: (-p["count"], p["min"]))
+    return analyses
+
+
+def analyze_items(offers: Sequence[Offer], min_price: float = None, max_price: float = None,
+                  percentiles: Iterable[float] = DEFAULT_PERCENTILES, per_merchant: bool = True,
+                  per_product: bool = True) -> Dict:
+    return analyze_result_sets([offers], min_price, max_price, percentiles, per_merchant, per_product)[0]
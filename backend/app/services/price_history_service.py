@@ -0,0 +1,119 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert
+
+from app.models.db import db
+from app.models.price_model import PriceObservation
+from app.utils.sql import LIKE_ESCAPE, like_pattern
+from .offers import Offer
+
+logger = logging.getLogger(__name__)
+
+# Buckets accepted by the series endpoint, mapped onto Postgres date_trunc units.
+SERIES_BUCKETS = ("minute", "hour", "day", "week", "month")
+
+
+class PriceHistoryStore:
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+
+    def to_row(self, offer: Offer) -> Dict:
+        return {
+            "product_key": offer.product_key,
+            "product_title": (offer.title or "")[:500],
+            "merchant": (offer.merchant or "")[:200],
+            "price": offer.price,
+            "original_price": offer.original_price,
+            "search_query": (offer.query or "")[:200] or None,
+            "link": offer.link,
+            "observed_at": offer.scraped_at or datetime.utcnow(),
+        }
+
+    def record_observations(self, offers: Iterable[Offer], commit: bool = True) -> int:
+        """Bulk-insert monitored offers; offers without a price are skipped."""
+        inserted = 0
+        batch = []
+        for offer in offers:
+            if offer.price is None:
+                continue
+            batch.append(self.to_row(offer))
+            if len(batch) >= self.batch_size:
+                db.session.execute(insert(PriceObservation), batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(insert(PriceObservation), batch)
+            inserted += len(batch)
+        if commit:
+            db.session.commit()
+        logger.info(f"[PriceHistoryStore] Recorded {inserted} price observations.")
+        return inserted
+
+    def get_series(self, product_key: str, start: datetime = None, end: datetime = None,
+                   bucket: str = "day", merchant: str = None, per_merchant: bool = False) -> List[Dict]:
+        """Downsampled price series: min/max/avg/count per time bucket (and merchant)."""
+        if bucket not in SERIES_BUCKETS:
+            raise ValueError(f"bucket must be one of {', '.join(SERIES_BUCKETS)}")
+
+        bucket_col = func.date_trunc(bucket, PriceObservation.observed_at).label("bucket")
+        columns = [
+            bucket_col,
+            func.min(PriceObservation.price).label("min"),
+            func.max(PriceObservation.price).label("max"),
+            func.avg(PriceObservation.price).label("avg"),
+            func.count(PriceObservation.id).label("count"),
+        ]
+        group_by = [bucket_col]
+        if per_merchant:
+            columns.insert(1, PriceObservation.merchant)
+            group_by.append(PriceObservation.merchant)
+
+        query = db.session.query(*columns).filter(PriceObservation.product_key == product_key)
+        if merchant:
+            query = query.filter(PriceObservation.merchant == merchant)
+        if start:
+            query = query.filter(PriceObservation.observed_at >= start)
+        if end:
+            query = query.filter(PriceObservation.observed_at < end)
+
+        series = []
+        for row in query.group_by(*group_by).order_by(bucket_col).all():
+            point = {
+                "bucket": row.bucket.isoformat(),
+                "min": row.min,
+                "max": row.max,
+                "avg": round(float(row.avg), 2),
+                "count": row.count,
+            }
+            if per_merchant:
+                point["merchant"] = row.merchant
+            series.append(point)
+        return series
+
+    def lowest_price(self, product_key: str, merchant: str = None) -> Optional[float]:
+        """Lowest recorded price of a product, optionally at one merchant (case-insensitive)."""
+        query = db.session.query(func.min(PriceObservation.price)).filter(PriceObservation.product_key == product_key)
+        if merchant:
+            query = query.filter(func.lower(PriceObservation.merchant) == merchant.strip().lower())
+        return query.scalar()
+
+    def search_products(self, text: str = None, limit: int = 20) -> List[Dict]:
+        """Products with recorded history, most recently observed first."""
+        last_seen = func.max(PriceObservation.observed_at).label("last_seen")
+        query = db.session.query(
+            PriceObservation.product_key,
+            func.max(PriceObservation.product_title).label("title"),
+            func.count(PriceObservation.id).label("observations"),
+            last_seen,
+        )
+        if text:
+            query = query.filter(PriceObservation.product_title.ilike(like_pattern(text), escape=LIKE_ESCAPE))
+        rows = query.group_by(PriceObservation.product_key).order_by(last_seen.desc()).limit(limit).all()
+        return [{
+            "productKey": row.product_key,
+            "title": row.title,
+            "observations": row.observations,
+            "lastSeen": row.last_seen.isoformat(),
+        } for row in rows]
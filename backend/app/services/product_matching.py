@@ -0,0 +1,334 @@
+"""Near-duplicate offer matching with MinHash signatures and LSH banding.
+
+Every title is reduced to character shingles and a MinHash signature; the
+signature is split into bands and each band is a bucket key. Offers only
+ever get compared with the few offers sharing a bucket, so adding a batch
+costs time proportional to the batch, not to the size of the index.
+Matched offers are merged with an incremental union-find into canonical
+products whose key is the ``product_key`` of the cluster's first offer, and
+every assignment is persisted so it survives restarts and index resets.
+"""
+import logging
+import re
+import threading
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.db import db
+from app.models.price_model import ProductAlias
+from .offers import Offer, normalize_title, product_key_for
+from .price_history_service import PriceHistoryStore
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 16 bands x 4 rows: candidate pairs start around Jaccard ~0.5
+MATCH_THRESHOLD = 0.6
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+# Tokens with digits (model numbers, capacities, sizes) must agree for a match,
+# so "iPhone 15 128GB" and "iPhone 15 256GB" stay different products.
+_NUMERIC_TOKEN = re.compile(r"\b\w*\d\w*\b")
+
+
+def match_text(title: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", normalize_title(title)).split())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[int]:
+    if len(text) <= size:
+        return [zlib.crc32(text.encode("utf-8"))]
+    return list({zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1)})
+
+
+def numeric_signature(text: str) -> Tuple[str, ...]:
+    return tuple(sorted(set(_NUMERIC_TOKEN.findall(text))))
+
+
+class MinHasher:
+    """Vectorized MinHash: signatures for a whole batch of shingle sets at once."""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # a*x stays below 2**64 because a < 2**32 and x < 2**32.
+        self.a = rng.randint(1, 1 << 32, size=num_permutations, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_permutations, dtype=np.uint64)
+
+    def signatures(self, shingle_sets: Sequence[List[int]]) -> np.ndarray:
+        lengths = np.fromiter((len(s) for s in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+        flat = np.fromiter((h for s in shingle_sets for h in s), dtype=np.uint64, count=int(lengths.sum()))
+        hashed = (self.a[:, None] * flat[None, :] + self.b[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.minimum.reduceat(hashed, starts, axis=1).T
+
+
+class ProductAliasStore:
+    """Persisted ``product_key -> canonical_key`` assignments shared by every process.
+
+    An offer key keeps the canonical product it was first assigned across
+    restarts and index resets. Offers are matched on query executor threads,
+    so every call runs in its own app context and session.
+    """
+
+    def __init__(self, app, chunk_size: int = 500):
+        self.app = app
+        self.chunk_size = chunk_size
+
+    def lookup(self, product_keys: Iterable[str]) -> Dict[str, str]:
+        product_keys = sorted(set(product_keys))
+        found = {}
+        with self.app.app_context():
+            for start in range(0, len(product_keys), self.chunk_size):
+                chunk = product_keys[start:start + self.chunk_size]
+                found.update(
+                    db.session.query(ProductAlias.product_key, ProductAlias.canonical_key)
+                    .filter(ProductAlias.product_key.in_(chunk))
+                    .all()
+                )
+        return found
+
+    def save(self, aliases: Dict[str, str]) -> None:
+        """Record new assignments; keys already recorded (e.g. by another worker) keep theirs."""
+        if not aliases:
+            return
+        rows = [{"product_key": key, "canonical_key": canonical} for key, canonical in aliases.items()]
+        with self.app.app_context():
+            insert = postgresql.insert if db.engine.dialect.name == "postgresql" else sqlite.insert
+            db.session.execute(insert(ProductAlias).on_conflict_do_nothing(index_elements=["product_key"]), rows)
+            db.session.commit()
+
+
+class ProductIndex:
+    """Incremental MinHash/LSH index grouping near-duplicate offers into products.
+
+    ``assign(offers)`` rewrites each offer's ``product_key`` to its canonical
+    product. Offers with the same SerpAPI ``product_id`` or the same
+    normalized title are merged directly; otherwise a new offer joins the
+    oldest product with an LSH candidate whose estimated title similarity
+    reaches ``threshold`` and whose numeric tokens agree. Existing products
+    are never merged with each other, so a canonical key never changes once
+    rules or history refer to it. With an ``aliases`` store, assignments are
+    persisted and take precedence over the in-memory index.
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD, bands: int = BANDS,
+                 num_permutations: int = NUM_PERMUTATIONS, max_entries: int = 200000,
+                 aliases: Optional[ProductAliasStore] = None,
+                 seed: Optional[Callable[[], Iterable[Tuple[str, str]]]] = None):
+        if num_permutations % bands:
+            raise ValueError("num_permutations must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_permutations // bands
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_permutations)
+        self.aliases = aliases
+        self.seed = seed  # (product_key, title) rows reloaded after a reset
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._parent = []       # union-find parent per entry
+        self._keys = []         # product_key of each entry (canonical key of a root)
+        self._signatures = np.empty((1024, self.rows * self.bands), dtype=np.uint64)  # grown by doubling
+        self._buckets = {}      # (band, numeric tokens, band bytes) -> [entry]
+        self._by_title = {}     # match text -> entry
+        self._by_key = {}       # product_key / product_id -> entry
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def _find(self, entry: int) -> int:
+        root = entry
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[entry] != root:
+            self._parent[entry], entry = root, self._parent[entry]
+        return root
+
+    def _band_keys(self, signature: np.ndarray, numeric: Tuple[str, ...]):
+        # Numeric tokens must agree anyway, so they are part of every bucket key
+        # and offers with different model numbers are never even compared.
+        for band in range(self.bands):
+            yield band, numeric, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _add(self, key: str, text: str, signature: np.ndarray, numeric: Tuple[str, ...],
+             aliases: Sequence[Optional[str]] = (), match: bool = True) -> int:
+        entry = len(self._parent)
+        if entry == len(self._signatures):
+            self._signatures = np.concatenate((self._signatures, np.empty_like(self._signatures)))
+        self._signatures[entry] = signature
+        self._parent.append(entry)
+        self._keys.append(key)
+        self._by_title.setdefault(text, entry)
+        for alias in (key, *aliases):
+            if alias:
+                self._by_key.setdefault(alias, entry)
+
+        candidates = set()
+        for band_key in self._band_keys(signature, numeric):
+            bucket = self._buckets.setdefault(band_key, [])
+            candidates.update(bucket)
+            bucket.append(entry)
+        if match and candidates:
+            candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarity = (self._signatures[candidates] == signature).mean(axis=1)
+            roots = {self._find(candidate) for candidate in candidates[similarity >= self.threshold].tolist()}
+            if roots:
+                # Join the oldest matching product only: bridging two existing
+                # products would re-key one of them.
+                self._parent[entry] = min(roots)
+        return entry
+
+    def _add_titles(self, rows: List[Tuple[str, str]]) -> int:
+        rows = [(key, text) for key, text in rows if text not in self._by_title and key not in self._by_key]
+        if not rows:
+            return 0
+        signatures = self.hasher.signatures([shingles(text) for _, text in rows])
+        for (key, text), signature in zip(rows, signatures):
+            # Seeded rows are already distinct products; they are not merged with each other.
+            self._add(key, text, signature, numeric_signature(text), match=False)
+        return len(rows)
+
+    def add_titles(self, rows: Iterable[Tuple[str, str]]) -> int:
+        """Seed the index with ``(product_key, title)`` pairs, e.g. from price history."""
+        rows = [(key, text) for key, text in ((key, match_text(title)) for key, title in rows if title) if text]
+        with self._lock:
+            return self._add_titles(rows)
+
+    def _stored_aliases(self, product_keys: Iterable[str]) -> Dict[str, str]:
+        if self.aliases is None:
+            return {}
+        try:
+            return self.aliases.lookup(product_keys)
+        except Exception as e:
+            logger.warning(f"[ProductIndex] Loading stored product aliases failed: {e}")
+            return {}
+
+    def _store_aliases(self, aliases: Dict[str, str]) -> None:
+        if self.aliases is None or not aliases:
+            return
+        try:
+            self.aliases.save(aliases)
+        except Exception as e:
+            logger.warning(f"[ProductIndex] Saving product aliases failed: {e}")
+
+    def assign(self, offers: Sequence[Offer]) -> Dict[str, int]:
+        """Set each offer's ``product_key`` to its canonical product; returns ``{product_key: offers}``."""
+        keys = [offer.product_key or product_key_for({"product_id": offer.product_id, "title": offer.title})
+                for offer in offers]
+        texts = [match_text(offer.title) for offer in offers]
+        # Keys this process has not seen may have been assigned before a restart
+        # or reset, or by another worker; those assignments win.
+        unseen = {key for key in keys if key not in self._by_key}
+        stored = self._stored_aliases(unseen)
+
+        with self._lock:
+            if len(self._parent) + len(offers) > self.max_entries:
+                logger.info(f"[ProductIndex] Reached {self.max_entries} entries, starting a fresh index.")
+                self._reset()
+                if self.seed is not None:
+                    try:
+                        rows = ((key, match_text(title)) for key, title in self.seed() if title)
+                        logger.info(f"[ProductIndex] Re-seeded with {self._add_titles([r for r in rows if r[1]])} products.")
+                    except Exception as e:
+                        logger.warning(f"[ProductIndex] Re-seeding failed: {e}")
+
+            # Offers whose key, product id or title is already indexed need no signature.
+            entries = [None] * len(offers)
+            pending = []
+            for position, (offer, key, text) in enumerate(zip(offers, keys, texts)):
+                entries[position] = self._known(key, offer.product_id, text, stored.get(key))
+                # Empty titles (e.g. only punctuation) say nothing about the product.
+                if entries[position] is None and text:
+                    pending.append(position)
+
+            if pending:
+                signatures = self.hasher.signatures([shingles(texts[p]) for p in pending])
+                for position, signature in zip(pending, signatures):
+                    offer, key, text = offers[position], keys[position], texts[position]
+                    canonical = stored.get(key)
+                    existing = self._known(key, offer.product_id, text, canonical)  # duplicates within this batch
+                    if existing is not None:
+                        entries[position] = existing
+                        continue
+                    # A stored product starts its own root; only new keys are matched.
+                    entries[position] = self._add(canonical or key, text, signature, numeric_signature(text),
+                                                  (key, offer.product_id), match=canonical is None)
+
+            counts = {}
+            new_aliases = {}
+            for offer, key, entry in zip(offers, keys, entries):
+                canonical = stored.get(key)
+                if canonical is None:
+                    canonical = key if entry is None else self._keys[self._find(entry)]
+                    if key in unseen:
+                        new_aliases[key] = canonical
+                elif entry is not None and self._keys[self._find(entry)] == canonical:
+                    self._by_key.setdefault(key, entry)  # no lookup for this key next time
+                offer.product_key = canonical
+                counts[canonical] = counts.get(canonical, 0) + 1
+
+        self._store_aliases(new_aliases)
+        return counts
+
+    def _known(self, key: str, product_id: Optional[str], text: str, canonical: Optional[str]) -> Optional[int]:
+        """Indexed entry an offer belongs to without comparing signatures, if any."""
+        if canonical is not None:
+            return self._by_key.get(canonical)
+        known = self._by_key.get(key)
+        if known is None and product_id:
+            known = self._by_key.get(product_id)
+        if known is None and text:
+            known = self._by_title.get(text)
+        return known
+
+    def canonical_key(self, product_key: str) -> str:
+        with self._lock:
+            entry = self._by_key.get(product_key)
+            if entry is not None:
+                return self._keys[self._find(entry)]
+        return self._stored_aliases([product_key]).get(product_key, product_key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            roots = sum(1 for entry, parent in enumerate(self._parent) if entry == parent)
+            return {"entries": len(self._parent), "products": roots, "buckets": len(self._buckets)}
+
+
+def get_product_index() -> Optional[ProductIndex]:
+    """Process-wide ProductIndex for the current app (None when matching is disabled).
+
+    Built on first use and seeded with the most recently observed products
+    from price history; assignments are persisted in ``product_aliases``, so
+    restarts, resets and other workers keep assigning the same canonical keys.
+    """
+    config = current_app.config
+    if not config["PRODUCT_MATCHING_ENABLED"]:
+        return None
+    index = current_app.extensions.get("product_index")
+    if index is None:
+        app = current_app._get_current_object()
+
+        def seed():
+            with app.app_context():
+                products = PriceHistoryStore().search_products(limit=config["PRODUCT_INDEX_SEED_LIMIT"])
+            return [(product["productKey"], product["title"]) for product in products]
+
+        index = ProductIndex(threshold=config["PRODUCT_MATCH_THRESHOLD"],
+                             max_entries=config["PRODUCT_INDEX_MAX_ENTRIES"],
+                             aliases=ProductAliasStore(app), seed=seed)
+        try:
+            seeded = index.add_titles(seed())
+            logger.info(f"[ProductIndex] Seeded with {seeded} products from price history.")
+        except Exception as e:
+            logger.warning(f"[ProductIndex] Seeding from price history failed: {e}")
+        # setdefault keeps a single instance if two threads race on first use.
+        index = current_app.extensions.setdefault("product_index", index)
+    return index
@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterator, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class QueryOutcome:
+    """Result of a single query run: either ``results`` or ``error`` is set."""
+
+    __slots__ = ("query", "results", "error", "elapsed")
+
+    def __init__(self, query: Any, results: Any = None, error: str = None, elapsed: float = 0.0):
+        self.query = query
+        self.results = results
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        return {
+            "query": self.query,
+            "ok": self.ok,
+            "error": self.error,
+            "elapsed": round(self.elapsed, 3),
+            "result_count": len(self.results) if self.results is not None else 0,
+        }
+
+
+class RateLimiter:
+    """Spaces calls so that at most ``rate`` start per second across all threads."""
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = 1.0 / rate
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _execute(fn: Callable[[Any, float], Any], queries: Sequence[Any], outcomes: List[QueryOutcome],
+             max_workers: int, rate_limit: float, timeout: float) -> Iterator[int]:
+    """Fill ``outcomes`` by running every query, yielding each index as it completes."""
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    started = {}
+
+    def task(index: int):
+        if limiter:
+            limiter.acquire()
+        started[index] = time.monotonic()
+        return fn(queries[index], timeout)
+
+    def record(index: int, call):
+        outcome = outcomes[index]
+        try:
+            outcome.results = call()
+        except Exception as e:
+            outcome.error = str(e) or type(e).__name__
+        outcome.elapsed = time.monotonic() - started.get(index, time.monotonic())
+
+    if max_workers <= 1 or len(queries) <= 1:
+        for index in range(len(queries)):
+            record(index, lambda: task(index))
+            yield index
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+    try:
+        pending = {executor.submit(task, index): index for index in range(len(queries))}
+        while pending:
+            done, _ = wait(pending, timeout=0.1 if timeout else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                record(index, future.result)
+                yield index
+
+            if timeout:
+                now = time.monotonic()
+                for future, index in list(pending.items()):
+                    start = started.get(index)
+                    if start is not None and now - start > timeout:
+                        del pending[future]
+                        future.cancel()
+                        outcomes[index].error = f"Timed out after {timeout}s"
+                        outcomes[index].elapsed = now - start
+                        yield index
+    finally:
+        # Overrun threads are bounded by the HTTP timeout handed to ``fn``;
+        # don't block the caller waiting for them. Queries not started yet
+        # (e.g. the consumer stopped iterating) are dropped.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_queries(fn: Callable[[Any, float], Any], queries: Sequence[Any], max_workers: int = 1,
+                rate_limit: float = None, timeout: float = None) -> List[QueryOutcome]:
+    """Run ``fn(query, timeout)`` for every query and return outcomes in input order.
+
+    ``max_workers`` bounds concurrency, ``rate_limit`` caps query starts per
+    second and ``timeout`` is the per-query budget in seconds. ``fn`` receives
+    the timeout so it can pass it on to the underlying HTTP call; a query that
+    still overruns is reported as timed out and its late result is discarded.
+    Exceptions never escape: each one becomes that query's ``error``.
+    """
+    outcomes = [QueryOutcome(query) for query in queries]
+    for _ in _execute(fn, queries, outcomes, max_workers, rate_limit, timeout):
+        pass
+    return outcomes
+
+
+def iter_outcomes(fn: Callable[[Any, float], Any], queries: Sequence[Any], max_workers: int = 1,
+                  rate_limit: float = None, timeout: float = None) -> Iterator[QueryOutcome]:
+    """Like ``run_queries`` but yields each outcome as soon as it completes.
+
+    Outcomes arrive in completion order, so a consumer can process (and
+    release) one query's results while the others are still running.
+    Closing the generator early cancels queries that have not started.
+    """
+    queries = list(queries)
+    outcomes = [QueryOutcome(query) for query in queries]
+    for index in _execute(fn, queries, outcomes, max_workers, rate_limit, timeout):
+        outcome = outcomes[index]
+        outcomes[index] = None  # the consumer owns it now
+        yield outcome
@@ -0,0 +1,247 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.utils.single_flight import RedisFlightLock, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def make_search_key(query: str, category: str = None, gl: str = "za", hl: str = "en", num_results: int = 10) -> Tuple:
+    """Normalize search parameters into a hashable cache key.
+
+    Whitespace and case differences in the query/category must not produce
+    separate cache entries, so both are collapsed before building the tuple.
+    """
+    norm_query = " ".join((query or "").lower().split())
+    norm_category = " ".join((category or "").lower().split())
+    return (norm_query, norm_category, (gl or "").lower(), (hl or "").lower(), min(int(num_results), 100))
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with a size bound and a per-entry TTL."""
+
+    shared = False
+
+    def __init__(self, max_size: int = 512, ttl: int = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Tuple[Optional[Dict], bool]:
+        """Return ``(value, expired)``; ``value`` is None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None, True
+            self._entries.move_to_end(key)
+            return value, False
+
+    def set(self, key: Tuple, value: Dict, ttl: int = None) -> int:
+        """Store a value and return how many entries were evicted to make room."""
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: Tuple) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Shared cache backend so every gunicorn worker sees the same entries.
+
+    Redis enforces TTLs natively; size-based eviction is delegated to the
+    server's ``maxmemory-policy`` (e.g. ``allkeys-lru``).
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int = 300, prefix: str = "serp:"):
+        import redis  # optional dependency, only needed for the shared backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _redis_key(self, key: Tuple) -> str:
+        return self.prefix + json.dumps(list(key), separators=(",", ":"))
+
+    def get(self, key: Tuple) -> Tuple[Optional[Dict], bool]:
+        raw = self.client.get(self._redis_key(key))
+        if raw is None:
+            return None, False
+        return json.loads(raw), False
+
+    def set(self, key: Tuple, value: Dict, ttl: int = None) -> int:
+        self.client.set(self._redis_key(key), json.dumps(value), ex=ttl if ttl is not None else self.ttl)
+        return 0
+
+    def delete(self, key: Tuple) -> None:
+        self.client.delete(self._redis_key(key))
+
+    def clear(self) -> None:
+        for redis_key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(redis_key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+
+
+class SearchCache:
+    """Result cache placed in front of SerpAPI calls.
+
+    Follows the Flask extension pattern used for ``db``/``mail``: a module level
+    instance is created here and bound to the app in ``create_app``.
+
+    Concurrent misses for the same key share one upstream call (single
+    flight). With the Redis backend a lock in Redis extends that across
+    worker processes: one fetches, the others wait for the shared entry.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.flight = SingleFlight("search_cache")
+        self.lock = None
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "bypassed": 0, "refreshes": 0}
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app):
+        config = app.config
+        if not config.get("SEARCH_CACHE_ENABLED", True):
+            self.backend = None
+        elif config.get("SEARCH_CACHE_BACKEND") == "redis":
+            self.backend = RedisCacheBackend(config["REDIS_URL"], ttl=config.get("SEARCH_CACHE_TTL", 300))
+            if config.get("SEARCH_CACHE_LOCK_ENABLED", True):
+                self.lock = RedisFlightLock(
+                    self.backend.client,
+                    "search_cache",
+                    # Outside the "serp:" namespace, so size() and clear() never touch live locks.
+                    prefix="serp-lock:",
+                    lock_ttl=config.get("SEARCH_CACHE_LOCK_TTL", 30),
+                    wait_timeout=config.get("SEARCH_CACHE_LOCK_WAIT", 20),
+                )
+        else:
+            self.backend = MemoryCacheBackend(
+                max_size=config.get("SEARCH_CACHE_MAX_SIZE", 512),
+                ttl=config.get("SEARCH_CACHE_TTL", 300),
+            )
+        app.extensions["search_cache"] = self
+        logger.info(f"[SearchCache] Initialized with backend: {type(self.backend).__name__ if self.backend else 'disabled'}")
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _incr(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        try:
+            value, expired = self.backend.get(key)
+        except Exception as e:
+            # A broken shared backend must degrade to "miss", never fail the search.
+            logger.warning(f"[SearchCache] Backend read failed: {e}")
+            value, expired = None, False
+        if value is None:
+            self._incr("misses")
+            if expired:
+                self._incr("expired")
+            return None
+        self._incr("hits")
+        return value
+
+    def set(self, key: Tuple, value: Dict) -> None:
+        try:
+            evicted = self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"[SearchCache] Backend write failed: {e}")
+            return
+        if evicted:
+            self._incr("evictions", evicted)
+
+    def get_or_fetch(self, key: Tuple, fetch, bypass: bool = False, refresh: bool = False) -> Dict:
+        """Return the cached value for ``key`` or call ``fetch()`` and store it.
+
+        ``bypass`` skips the cache entirely (no read, no write); ``refresh``
+        skips the read but stores the fresh result.
+        """
+        if not self.enabled or bypass:
+            if self.enabled:
+                self._incr("bypassed")
+            # Still coalesced, under a separate key since nothing is stored.
+            return self.flight.do(("uncached",) + tuple(key), fetch)[0]
+
+        if refresh:
+            self._incr("refreshes")
+        else:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+        def fetch_and_store():
+            value = fetch()
+            self.set(key, value)
+            return value
+
+        def load():
+            if self.lock is None:
+                return fetch_and_store()
+            return self.lock.run(self.backend._redis_key(key), fetch_and_store, lambda: self._peek(key))
+
+        return self.flight.do(key, load)[0]
+
+    def _peek(self, key: Tuple) -> Optional[Dict]:
+        """Read without touching hit/miss stats (used while waiting on another worker)."""
+        try:
+            return self.backend.get(key)[0]
+        except Exception:
+            return None
+
+    def invalidate(self, key: Tuple) -> None:
+        if self.enabled:
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["coalesced"] = self.flight.coalesced
+        stats["backend"] = type(self.backend).__name__ if self.backend else None
+        if self.enabled:
+            try:
+                stats["size"] = self.backend.size()
+            except Exception:
+                stats["size"] = None
+        return stats
+
+
+search_cache = SearchCache()
@@ -1,21 +1,40 @@
 import logging
 from typing import Dict
-from serpapi import GoogleSearch
+from .search_cache import make_search_key
+from app.utils.inflight import inflight
+from app.utils.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Coalesces identical concurrent searches made without a cache (e.g. monitoring sweeps).
+_uncached_flight = SingleFlight("serpapi")
+
 class SerpService:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache=None):
         if not api_key:
             raise ValueError("SERP API key is required")
         self.api_key = api_key
+        self.cache = cache
         logger.info("[SerpService] Initialized with API key.")
 
-    def search_google(self, query: str, category: str = None, gl: str = "za", hl: str = "en", num_results: int = 10) -> Dict:
-        try:
-            if not query.strip():
-                raise ValueError("Search query cannot be empty.")
+    def search_google(self, query: str, category: str = None, gl: str = "za", hl: str = "en", num_results: int = 10,
+                      bypass_cache: bool = False, refresh_cache: bool = False, timeout: float = None) -> Dict:
+        if not query or not query.strip():
+            raise Exception("Google Shopping search failed: Search query cannot be empty.")
+
+        key = make_search_key(query, category, gl, hl, num_results)
+        if self.cache is None:
+            return _uncached_flight.do(key, lambda: self._fetch(query, category, gl, hl, num_results, timeout))[0]
 
+        return self.cache.get_or_fetch(
+            key,
+            lambda: self._fetch(query, category, gl, hl, num_results, timeout),
+            bypass=bypass_cache,
+            refresh=refresh_cache,
+        )
+
+    def _fetch(self, query: str, category: str, gl: str, hl: str, num_results: int, timeout: float = None) -> Dict:
+        try:
             full_query = query.strip()
             if category and category.strip():
                 full_query = f"{full_query} {category.strip()}"
@@ -31,8 +50,14 @@ class SerpService:
 
             logger.info(f"[SerpService] Initiating Google Shopping search with parameters: {params}")
             
+            # Imported on first search; serpapi (and requests) are slow to import.
+            from serpapi import GoogleSearch
+
             search = GoogleSearch(params)
-            results = search.get_dict()
+            if timeout:
+                search.timeout = timeout
+            with inflight.track("serpapi"):
+                results = search.get_dict()
 
             if "error" in results:
                 logger.error(f"[SerpService] SerpAPI error: {results['error']}")
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from app.models.db import db
+from app.models.watchlist_model import WatchlistQuery
+from .google_price_monitor_service import GooglePriceMonitorService
+from .offers import Offer, price_range_bounds
+from .price_alert_service import get_alert_engine
+from .price_history_service import PriceHistoryStore
+
+logger = logging.getLogger(__name__)
+
+
+def offer_key(offer: Offer) -> str:
+    return f"{offer.product_key}|{offer.merchant}"
+
+
+def price_snapshot(offers: List[Offer]) -> Dict[str, float]:
+    """Price per ``product_key|merchant``; volatile fields (position, thumbnails, timestamps) are ignored."""
+    return {offer_key(offer): offer.price for offer in offers if offer.price is not None}
+
+
+def snapshot_hash(snapshot: Dict[str, float]) -> str:
+    return hashlib.sha256(json.dumps(sorted(snapshot.items()), separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def changed_offers(offers: List[Offer], previous: Dict[str, float]) -> List[Offer]:
+    """Offers that are new or whose price differs from ``previous``."""
+    return [
+        offer for offer in offers
+        if offer.price is not None and previous.get(offer_key(offer)) != offer.price
+    ]
+
+
+def jittered_delay(seconds: float, jitter: float) -> float:
+    return seconds * random.uniform(1 - jitter, 1 + jitter)
+
+
+def initial_run_at(spread_seconds: float) -> datetime:
+    """First refresh for a new watchlist entry, spread so bulk additions don't fire together."""
+    return datetime.utcnow() + timedelta(seconds=random.uniform(0, spread_seconds))
+
+
+class WatchlistScheduler:
+    """Refreshes due watchlist queries in batches and records only price changes.
+
+    Due rows are claimed with ``FOR UPDATE SKIP LOCKED`` and leased, so several
+    scheduler processes can share the watchlist. Each refresh is rescheduled
+    ``interval_minutes`` later with +/- ``jitter``, so entries drift apart
+    instead of firing in bursts. A result set whose content hash matches the
+    previous run writes nothing; otherwise only new or re-priced offers are
+    inserted into ``price_observations``, and price alert rules are evaluated
+    against the changed result set.
+    """
+
+    def __init__(self, app, monitor: GooglePriceMonitorService, history_store: PriceHistoryStore = None,
+                 batch_size: int = 20, poll_interval: float = 10.0, jitter: float = 0.1,
+                 max_workers: int = 4, rate_limit: float = None, timeout: float = None,
+                 lease_seconds: int = 600, retry_base: float = 60.0):
+        self.app = app
+        self.monitor = monitor
+        self.history_store = history_store or PriceHistoryStore()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.jitter = jitter
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.lease_seconds = lease_seconds
+        self.retry_base = retry_base
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, app):
+        # numpy (via product matching) stays out of the API process's import path.
+        from .product_matching import get_product_index
+
+        config = app.config
+        with app.app_context():
+            product_index = get_product_index()
+            alert_engine = get_alert_engine()
+        return cls(
+            app,
+            GooglePriceMonitorService(config.get("SERP_API_KEY"), product_index=product_index,
+                                      alert_engine=alert_engine),
+            batch_size=config["WATCHLIST_BATCH_SIZE"],
+            poll_interval=config["WATCHLIST_POLL_INTERVAL"],
+            jitter=config["WATCHLIST_JITTER"],
+            max_workers=config["MONITOR_MAX_WORKERS"],
+            rate_limit=config["MONITOR_RATE_LIMIT"],
+            timeout=config["MONITOR_QUERY_TIMEOUT"],
+        )
+
+    def _claim_batch(self) -> List[WatchlistQuery]:
+        now = datetime.utcnow()
+        rows = (
+            WatchlistQuery.query
+            .filter(WatchlistQuery.is_active.is_(True), WatchlistQuery.next_run_at <= now)
+            .order_by(WatchlistQuery.next_run_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        lease_until = now + timedelta(seconds=self.lease_seconds)
+        for row in rows:
+            row.next_run_at = lease_until
+        db.session.commit()
+        return rows
+
+    @staticmethod
+    def _price_range(row: WatchlistQuery) -> Tuple[float, float]:
+        return price_range_bounds(row.price_min, row.price_max)
+
+    def run_once(self) -> int:
+        """Refresh one batch of due queries; returns the number of rows processed."""
+        rows = self._claim_batch()
+        if not rows:
+            return 0
+
+        # Rows sharing a price range are monitored together on the thread pool.
+        groups = {}
+        for row in rows:
+            groups.setdefault(self._price_range(row), []).append(row)
+
+        recorded = unchanged = failed = 0
+        alert_offers = []
+        now = datetime.utcnow()
+        for price_range, group in groups.items():
+            outcomes = self.monitor.monitor_queries(
+                [row.search_query for row in group],
+                price_range=price_range,
+                max_workers=self.max_workers,
+                rate_limit=self.rate_limit,
+                timeout=self.timeout,
+            )
+            for row, outcome in zip(group, outcomes):
+                row.last_run_at = now
+                if not outcome.ok:
+                    failed += 1
+                    row.consecutive_failures += 1
+                    row.last_error = str(outcome.error)[:2000]
+                    retry = min(self.retry_base * (2 ** (row.consecutive_failures - 1)), row.interval_minutes * 60)
+                    row.next_run_at = now + timedelta(seconds=jittered_delay(retry, self.jitter))
+                    logger.warning(f"[WatchlistScheduler] Refresh failed for '{row.search_query}': {outcome.error}")
+                    continue
+
+                row.consecutive_failures = 0
+                row.last_error = None
+                row.next_run_at = now + timedelta(seconds=jittered_delay(row.interval_minutes * 60, self.jitter))
+
+                snapshot = price_snapshot(outcome.results)
+                digest = snapshot_hash(snapshot)
+                if digest == row.last_result_hash:
+                    unchanged += 1
+                    continue
+
+                recorded += self.history_store.record_observations(
+                    changed_offers(outcome.results, row.last_prices or {}), commit=False)
+                # Alert rules see the full result set so "any merchant" rules get the best price.
+                alert_offers.extend(outcome.results)
+                row.last_result_hash = digest
+                row.last_prices = snapshot
+                row.last_changed_at = now
+
+        # Evaluated after all SerpAPI calls so the rule row locks are held only
+        # until the commit below, not across the network I/O of later groups.
+        alerts = self.monitor.check_alerts(alert_offers, commit=False)
+        db.session.commit()
+        logger.info(f"[WatchlistScheduler] Refreshed {len(rows)} queries: {unchanged} unchanged, "
+                    f"{failed} failed, {recorded} price changes recorded, {alerts} alerts triggered.")
+        return len(rows)
+
+    def run_forever(self) -> None:
+        logger.info("[WatchlistScheduler] Started.")
+        while not self._stop.is_set():
+            with self.app.app_context():
+                try:
+                    processed = self.run_once()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.exception(f"[WatchlistScheduler] Batch failed: {e}")
+                    processed = 0
+                finally:
+                    db.session.remove()
+            if processed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+        logger.info("[WatchlistScheduler] Stopped.")
+
+    def start(self) -> "WatchlistScheduler":
+        self._thread = threading.Thread(target=self.run_forever, name="watchlist-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -0,0 +1,51 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class InFlightTracker:
+    """Counts outbound calls in progress so shutdown can wait for them to finish."""
+
+    def __init__(self):
+        self._counts = {}
+        self._total = 0
+        self._idle = threading.Condition()
+
+    def begin(self, name: str) -> None:
+        with self._idle:
+            self._counts[name] = self._counts.get(name, 0) + 1
+            self._total += 1
+
+    def end(self, name: str) -> None:
+        with self._idle:
+            self._counts[name] -= 1
+            self._total -= 1
+            if self._total == 0:
+                self._idle.notify_all()
+
+    @contextmanager
+    def track(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Block until no calls are in flight; returns False if ``timeout`` ran out first."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._total:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+            return True
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._idle:
+            return {name: count for name, count in self._counts.items() if count}
+
+
+inflight = InFlightTracker()
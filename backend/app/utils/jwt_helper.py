@@ -1,12 +1,107 @@
 import jwt
 import datetime
-from flask import current_app
+import time
+from functools import wraps
+from flask import current_app, g, jsonify, request
+from app.services.search_cache import MemoryCacheBackend
 
-def generate_jwt(user_id, role):
+ACCESS_TOKEN = 'access'
+REFRESH_TOKEN = 'refresh'
+
+
+def _encode(user_id, role, token_type, lifetime):
+    now = datetime.datetime.utcnow()
     payload = {
         'user_id': user_id,
         'role': role,  # ✅ include the user's role in the token
-        'exp': datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        'typ': token_type,
+        'iat': now,
+        'exp': now + datetime.timedelta(seconds=lifetime)
     }
-    token = jwt.encode(payload, current_app.config['SECRET_KEY'], algorithm='HS256')
-    return token
+    return jwt.encode(payload, current_app.config['SECRET_KEY'], algorithm='HS256')
+
+
+def generate_jwt(user_id, role):
+    return _encode(user_id, role, ACCESS_TOKEN, current_app.config['JWT_ACCESS_TTL'])
+
+
+def generate_refresh_jwt(user_id, role):
+    return _encode(user_id, role, REFRESH_TOKEN, current_app.config['JWT_REFRESH_TTL'])
+
+
+def _verified_tokens():
+    """Recently verified tokens: signature -> (token, claims), expiring with the token."""
+    cache = current_app.extensions.get('jwt_verified_tokens')
+    if cache is None:
+        cache = current_app.extensions.setdefault('jwt_verified_tokens', MemoryCacheBackend(
+            max_size=current_app.config['JWT_CACHE_MAX_SIZE'],
+            ttl=current_app.config['JWT_ACCESS_TTL'],
+        ))
+    return cache
+
+
+def verify_jwt(token, token_type=ACCESS_TOKEN):
+    """Return the claims of a valid HS256 token or raise ``jwt.InvalidTokenError``.
+
+    Tokens already verified by this process are served from a bounded LRU
+    keyed by their signature, skipping the decode and HMAC work.
+    """
+    signature = token.rpartition('.')[2]
+    cache = _verified_tokens()
+    cached, _ = cache.get(signature)
+    # The signature is only a cache key; the full token must match too.
+    if cached is not None and cached[0] == token:
+        claims = cached[1]
+    else:
+        claims = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+        remaining = claims['exp'] - time.time()
+        if remaining > 0:
+            cache.set(signature, (token, claims), ttl=remaining)
+
+    # Tokens issued before refresh support carry no "typ" and are access tokens.
+    if claims.get('typ', ACCESS_TOKEN) != token_type:
+        raise jwt.InvalidTokenError(f"Expected a {token_type} token")
+    return claims
+
+
+def _bearer_token():
+    header = request.headers.get('Authorization', '')
+    scheme, _, token = header.partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+    return token.strip()
+
+
+def jwt_required(fn=None, roles=None):
+    """Require a valid access token; claims are exposed on ``g.jwt_claims``.
+
+    Use as ``@jwt_required`` or ``@jwt_required(roles=['admin'])``; roles
+    compare case-insensitively ("Admin" and "admin" are the same role).
+    """
+    allowed = {role.lower() for role in roles} if roles else None
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            token = _bearer_token()
+            if token is None:
+                return jsonify({"error": "Authorization token is missing"}), 401
+            try:
+                claims = verify_jwt(token)
+            except jwt.ExpiredSignatureError:
+                return jsonify({"error": "Token has expired"}), 401
+            except jwt.InvalidTokenError:
+                return jsonify({"error": "Invalid token"}), 401
+
+            if allowed and (claims.get('role') or '').lower() not in allowed:
+                return jsonify({"error": "You do not have permission to perform this action"}), 403
+
+            g.jwt_claims = claims
+            g.user_id = claims.get('user_id')
+            g.role = claims.get('role')
+            return view(*args, **kwargs)
+        return wrapper
+
+    if fn is not None:
+        return decorator(fn)
+    return decorator
@@ -0,0 +1,68 @@
+import threading
+from collections import deque
+from typing import Dict
+
+
+class LatencyStats:
+    """Running latency summary with a bounded window of recent samples for percentiles."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds: float, error: bool = False) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        if error:
+            self.errors += 1
+
+    def snapshot(self) -> Dict:
+        ordered = sorted(self.recent)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 1) if ordered else None
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "max_ms": round(self.max * 1000, 1),
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Process-local counters and latency timers, exposed on GET /api/metrics."""
+
+    def __init__(self):
+        self._counters = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            stats = self._timers.get(name)
+            if stats is None:
+                stats = self._timers[name] = LatencyStats()
+            stats.add(seconds, error)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "latency": {name: stats.snapshot() for name, stats in self._timers.items()},
+            }
+
+
+metrics = MetricsRegistry()
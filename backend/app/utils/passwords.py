@@ -0,0 +1,42 @@
+import hmac
+from functools import lru_cache
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Werkzeug hash strings look like "<method>$<salt>$<hash>".
+HASH_PREFIXES = ("scrypt:", "pbkdf2:")
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method: str) -> str:
+    """Full method string Werkzeug stores for ``method`` (defaults filled in)."""
+    return generate_password_hash("probe", method=method).split("$", 1)[0]
+
+
+def _configured_method() -> str:
+    return current_app.config["PASSWORD_HASH_METHOD"]
+
+
+def is_password_hash(stored: str) -> bool:
+    return bool(stored) and stored.startswith(HASH_PREFIXES) and stored.count("$") == 2
+
+
+def hash_password(password: str) -> str:
+    return generate_password_hash(password, method=_configured_method())
+
+
+def verify_password(stored: str, password: str):
+    """Return ``(valid, needs_rehash)``.
+
+    Rows created before hashing was introduced still hold plaintext; they are
+    compared in constant time and flagged for rehash, as are hashes made with
+    a different method or cost than the one currently configured.
+    """
+    if not stored or password is None:
+        return False, False
+    if not is_password_hash(stored):
+        valid = hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+        return valid, valid
+    valid = check_password_hash(stored, password)
+    needs_rehash = valid and stored.split("$", 1)[0] != _method_prefix(_configured_method())
+    return valid, needs_rehash
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight wait and receive the same result (or exception). Nothing is
+    remembered once the call finishes -- that is the cache's job.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(value, shared)``; ``shared`` is True when another caller's result was reused."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            metrics.incr(f"{self.name}.coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+# Deletes the lock only if we still own it (it may have expired and been re-taken).
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisFlightLock:
+    """Cross-process single flight on top of a shared result store.
+
+    The process that wins ``SET NX`` on the lock key runs the call and stores
+    the result; the others poll ``lookup()`` (the shared cache) until the
+    result shows up, the lock is released without one, or ``wait_timeout``
+    passes -- then they fall back to calling upstream themselves. Any Redis
+    error also falls back, so the lock can only save calls, never fail them.
+    """
+
+    def __init__(self, client, name: str, prefix: str = "lock:", lock_ttl: float = 30.0,
+                 wait_timeout: float = 20.0, poll_interval: float = 0.1):
+        self.client = client
+        self.name = name
+        self.prefix = prefix
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._release = client.register_script(_RELEASE_SCRIPT)
+
+    def run(self, lock_name: str, fetch_and_store: Callable[[], Any],
+            lookup: Callable[[], Optional[Any]]) -> Any:
+        lock_key = self.prefix + lock_name
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+        except Exception as e:
+            logger.warning(f"[RedisFlightLock] Lock unavailable, fetching directly: {e}")
+            return fetch_and_store()
+
+        if acquired:
+            try:
+                return fetch_and_store()
+            finally:
+                try:
+                    self._release(keys=[lock_key], args=[token])
+                except Exception as e:
+                    logger.warning(f"[RedisFlightLock] Lock release failed (expires in {self.lock_ttl}s): {e}")
+
+        deadline = time.monotonic() + self.wait_timeout
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                value = lookup()
+                if value is not None:
+                    metrics.incr(f"{self.name}.coalesced_remote")
+                    return value
+                if not self.client.exists(lock_key):
+                    break
+        except Exception as e:
+            logger.warning(f"[RedisFlightLock] Waiting on lock failed, fetching directly: {e}")
+        metrics.incr(f"{self.name}.lock_fallbacks")
+        return fetch_and_store()
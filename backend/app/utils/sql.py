@@ -0,0 +1,10 @@
+LIKE_ESCAPE = "\\"
+
+
+def like_pattern(text: str) -> str:
+    """Substring LIKE pattern matching ``%`` and ``_`` in ``text`` literally.
+
+    Pass ``escape=LIKE_ESCAPE`` to ``like``/``ilike`` along with it.
+    """
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
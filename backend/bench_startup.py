@@ -0,0 +1,77 @@
+"""Measure cold-start import cost of the app factory per process role.
+
+Usage: python bench_startup.py [--role api|worker|scheduler] [--top 20] [--runs 3]
+
+Each run starts a fresh interpreter with ``-X importtime`` and builds the app
+(with the environment from ``.env``, as run.py and wsgi.py load it), then reports wall time plus the modules with the highest cumulative and self
+import time (microseconds, from the slowest run's importtime output).
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+ROLES = ("api", "worker", "scheduler")
+
+
+def run_once(role: str):
+    code = f"from app import create_app; create_app(role={role!r})"
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        # Exits with status 1 so scripted benchmark runs notice the failure.
+        sys.exit(f"create_app(role={role!r}) failed:\n{proc.stderr[-2000:]}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return elapsed, modules
+
+
+def report(role: str, runs: int, top: int) -> None:
+    results = [run_once(role) for _ in range(runs)]
+    timings = sorted(elapsed for elapsed, _ in results)
+    _, modules = max(results, key=lambda result: result[0])
+
+    total_us = sum(self_us for _, self_us, _, _ in modules)
+    print(f"\n== role={role}  runs={runs}  wall min/median/max: "
+          f"{timings[0] * 1000:.0f}/{timings[len(timings) // 2] * 1000:.0f}/{timings[-1] * 1000:.0f} ms  "
+          f"imports: {len(modules)} modules, {total_us / 1000:.0f} ms")
+
+    print(f"-- top {top} top-level imports by cumulative time")
+    top_level = sorted((m for m in modules if m[3] == 0), key=lambda m: m[2], reverse=True)
+    for name, _, cumulative_us, _ in top_level[:top]:
+        print(f"{cumulative_us / 1000:10.1f} ms  {name}")
+
+    print(f"-- top {top} modules by self time")
+    for name, self_us, _, _ in sorted(modules, key=lambda m: m[1], reverse=True)[:top]:
+        print(f"{self_us / 1000:10.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--role", choices=ROLES, action="append", help="role(s) to measure (default: all)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # config reads os.environ only; the children inherit the variables loaded here.
+    load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+
+    for role in args.role or ROLES:
+        report(role, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Gunicorn settings for wsgi:app, tunable through environment variables.
+
+The API spends most of its time waiting on SerpAPI, Gemini and Postgres, so
+the default is the threaded ``gthread`` worker: a few processes, many threads
+each. ``GUNICORN_WORKER_CLASS=gevent`` (requires gevent) switches to
+cooperative workers for very high concurrency; ``sync`` gives one request per
+process. ``DB_POOL_SIZE`` defaults to ``GUNICORN_THREADS``, capped so that
+``workers x (pool + overflow)`` fits ``DB_MAX_CONNECTIONS`` (default 80, under
+Postgres's 100); raise that budget when the server allows more connections.
+With more than one worker, set ``CHAT_STORE_BACKEND=redis`` so chat
+conversations are visible to whichever worker handles the next turn.
+"""
+import multiprocessing
+import os
+import time
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("GUNICORN_WORKERS", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))  # gevent/eventlet only
+
+# Gemini streams and multi-query monitor runs can legitimately take a while.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically, staggered so they don't all restart at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_worker_init(worker):
+    app = worker.wsgi
+    if app.config["EMAIL_OUTBOX_INLINE_WORKER"]:
+        from app.services.email_outbox_service import OutboxWorker
+
+        app.extensions["outbox_worker"] = OutboxWorker.from_config(app).start()
+
+
+def worker_exit(server, worker):
+    """Let outbound SerpAPI/Gemini calls finish and stop the outbox sender before exiting."""
+    from app.utils.inflight import inflight
+
+    # Both waits share one graceful_timeout budget.
+    deadline = time.monotonic() + graceful_timeout
+    if not inflight.wait_idle(graceful_timeout):
+        worker.log.warning(f"Exiting with calls still in flight: {inflight.snapshot()}")
+
+    app = getattr(worker, "wsgi", None)
+    outbox_worker = app.extensions.get("outbox_worker") if app is not None else None
+    if outbox_worker is not None:
+        outbox_worker.stop(timeout=max(deadline - time.monotonic(), 0))
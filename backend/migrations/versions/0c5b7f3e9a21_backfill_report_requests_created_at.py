@@ -0,0 +1,38 @@
+"""Backfill report_requests.created_at and make it NOT NULL
+
+Revision ID: 0c5b7f3e9a21
+Revises: f2a6d81c4e93
+Create Date: 2026-10-18 19:05:42.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c5b7f3e9a21'
+down_revision = 'f2a6d81c4e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows created before created_at existed are older than every dated row:
+    # give them the oldest known timestamp so they sort last (ties broken by id)
+    # and keyset cursors never see a NULL.
+    op.execute(
+        "UPDATE report_requests SET created_at = COALESCE("
+        "(SELECT MIN(created_at) FROM report_requests), CURRENT_TIMESTAMP) "
+        "WHERE created_at IS NULL"
+    )
+    with op.batch_alter_table('report_requests', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report_requests', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=True)
@@ -0,0 +1,44 @@
+"""Add price_observations table
+
+Revision ID: 4b7e2a91c3d5
+Revises: dcf528086808
+Create Date: 2026-10-18 09:12:44.512031
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2a91c3d5'
+down_revision = 'dcf528086808'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('price_observations',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('product_key', sa.String(length=64), nullable=False),
+        sa.Column('product_title', sa.String(length=500), nullable=True),
+        sa.Column('merchant', sa.String(length=200), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('original_price', sa.Float(), nullable=True),
+        sa.Column('search_query', sa.String(length=200), nullable=True),
+        sa.Column('link', sa.Text(), nullable=True),
+        sa.Column('observed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('price_observations', schema=None) as batch_op:
+        batch_op.create_index('ix_price_observations_product_time', ['product_key', 'observed_at'], unique=False)
+        batch_op.create_index('ix_price_observations_product_merchant_time', ['product_key', 'merchant', 'observed_at'], unique=False)
+        batch_op.create_index('ix_price_observations_query_time', ['search_query', 'observed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('price_observations', schema=None) as batch_op:
+        batch_op.drop_index('ix_price_observations_query_time')
+        batch_op.drop_index('ix_price_observations_product_merchant_time')
+        batch_op.drop_index('ix_price_observations_product_time')
+
+    op.drop_table('price_observations')
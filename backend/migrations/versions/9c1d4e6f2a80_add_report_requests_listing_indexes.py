@@ -0,0 +1,32 @@
+"""Add report_requests listing indexes
+
+Revision ID: 9c1d4e6f2a80
+Revises: 4b7e2a91c3d5
+Create Date: 2026-10-18 10:03:27.118904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1d4e6f2a80'
+down_revision = '4b7e2a91c3d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report_requests', schema=None) as batch_op:
+        batch_op.create_index('ix_report_requests_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_report_requests_status', ['status'], unique=False)
+        batch_op.create_index('ix_report_requests_category', ['category'], unique=False)
+        batch_op.create_index('ix_report_requests_assigned_to_id', ['assigned_to_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_report_requests_assigned_to_id')
+        batch_op.drop_index('ix_report_requests_category')
+        batch_op.drop_index('ix_report_requests_status')
+        batch_op.drop_index('ix_report_requests_created_at_id')
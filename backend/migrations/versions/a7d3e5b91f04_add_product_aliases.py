@@ -0,0 +1,29 @@
+"""Add product_aliases table
+
+Revision ID: a7d3e5b91f04
+Revises: 0c5b7f3e9a21
+Create Date: 2026-10-18 21:07:32.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e5b91f04'
+down_revision = '0c5b7f3e9a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('product_aliases',
+        sa.Column('product_key', sa.String(length=64), nullable=False),
+        sa.Column('canonical_key', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('product_key')
+    )
+
+
+def downgrade():
+    op.drop_table('product_aliases')
@@ -0,0 +1,36 @@
+"""Add indexed name_key to user_management
+
+Revision ID: d5a9e3c71b42
+Revises: b3f8d02e5c17
+Create Date: 2026-10-18 12:41:19.330257
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9e3c71b42'
+down_revision = 'b3f8d02e5c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_management', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('name_key', sa.String(length=201), nullable=True))
+
+    # Backfill with the same normalization as UserDetails.name_key.
+    op.execute(
+        "UPDATE user_management "
+        "SET name_key = regexp_replace(lower(trim(first_name || ' ' || last_name)), '\\s+', ' ', 'g')"
+    )
+
+    with op.batch_alter_table('user_management', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_user_management_name_key'), ['name_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user_management', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_management_name_key'))
+        batch_op.drop_column('name_key')
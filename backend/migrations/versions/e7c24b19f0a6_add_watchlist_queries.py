@@ -0,0 +1,46 @@
+"""Add watchlist_queries table
+
+Revision ID: e7c24b19f0a6
+Revises: d5a9e3c71b42
+Create Date: 2026-10-18 18:32:47.915206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c24b19f0a6'
+down_revision = 'd5a9e3c71b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('watchlist_queries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('search_query', sa.String(length=200), nullable=False),
+        sa.Column('price_min', sa.Float(), nullable=True),
+        sa.Column('price_max', sa.Float(), nullable=True),
+        sa.Column('interval_minutes', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(), nullable=False),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_changed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_result_hash', sa.String(length=64), nullable=True),
+        sa.Column('last_prices', sa.JSON(), nullable=True),
+        sa.Column('consecutive_failures', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('search_query')
+    )
+    with op.batch_alter_table('watchlist_queries', schema=None) as batch_op:
+        batch_op.create_index('ix_watchlist_queries_active_next_run', ['is_active', 'next_run_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('watchlist_queries', schema=None) as batch_op:
+        batch_op.drop_index('ix_watchlist_queries_active_next_run')
+
+    op.drop_table('watchlist_queries')
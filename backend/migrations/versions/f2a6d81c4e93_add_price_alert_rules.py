@@ -0,0 +1,48 @@
+"""Add price_alert_rules table
+
+Revision ID: f2a6d81c4e93
+Revises: e7c24b19f0a6
+Create Date: 2026-10-18 18:41:09.352718
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d81c4e93'
+down_revision = 'e7c24b19f0a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('price_alert_rules',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('product_key', sa.String(length=64), nullable=False),
+        sa.Column('product_title', sa.String(length=500), nullable=True),
+        sa.Column('merchant', sa.String(length=200), nullable=False),
+        sa.Column('rule_type', sa.String(length=20), nullable=False),
+        sa.Column('threshold', sa.Float(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('last_price', sa.Float(), nullable=True),
+        sa.Column('reference_price', sa.Float(), nullable=True),
+        sa.Column('lowest_price', sa.Float(), nullable=True),
+        sa.Column('last_observed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_triggered_at', sa.DateTime(), nullable=True),
+        sa.Column('trigger_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('price_alert_rules', schema=None) as batch_op:
+        batch_op.create_index('ix_price_alert_rules_product_active', ['product_key', 'is_active'], unique=False)
+        batch_op.create_index('ix_price_alert_rules_email', ['email'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('price_alert_rules', schema=None) as batch_op:
+        batch_op.drop_index('ix_price_alert_rules_email')
+        batch_op.drop_index('ix_price_alert_rules_product_active')
+
+    op.drop_table('price_alert_rules')
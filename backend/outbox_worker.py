@@ -0,0 +1,11 @@
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+from app.services.email_outbox_service import OutboxWorker
+
+# Dedicated email sender process: `python outbox_worker.py`
+app = create_app(role="worker")
+
+if __name__ == '__main__':
+    OutboxWorker.from_config(app).run_forever()
@@ -2,11 +2,19 @@ import os
 from dotenv import load_dotenv 
 load_dotenv() 
 
+# The dev server sends queued email itself unless told otherwise.
+os.environ.setdefault("EMAIL_OUTBOX_INLINE_WORKER", "true")
+
 
 from app import create_app
+from app.services.email_outbox_service import OutboxWorker
 
 
 app = create_app()
 
+# Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`.
 if __name__ == '__main__':
+    # Only in the reloader's child process, so the worker isn't started twice.
+    if app.config["EMAIL_OUTBOX_INLINE_WORKER"] and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        OutboxWorker.from_config(app).start()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,11 @@
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+from app.services.watchlist_scheduler import WatchlistScheduler
+
+# Dedicated watchlist refresh process: `python scheduler.py`
+app = create_app(role="scheduler")
+
+if __name__ == '__main__':
+    WatchlistScheduler.from_config(app).run_forever()
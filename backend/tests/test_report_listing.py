@@ -0,0 +1,70 @@
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("SECRET_KEY", "test")
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from app.models.db import db
+from app.models.report_model import ReportRequest
+from app.models.usermanagement_model import UserDetails
+
+
+@pytest.fixture
+def app():
+    app = create_app(blueprints=["reports"])
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def seed_reports(count, start=0):
+    for i in range(start, start + count):
+        user = UserDetails(first_name=f"First{i}", last_name=f"Last{i}", gender="x", dob="2000-01-01",
+                           role="user", email=f"user{i}@example.com", phone="0", password="x")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(ReportRequest(request_id=f"REQ_{i}", category="tech", product=f"Product {i}",
+                                     status="Inprogress", assigned_to_id=user.id))
+    db.session.commit()
+
+
+def listing_statements(app):
+    """Fetch the report listing and return (rows, number of SQL statements executed)."""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = app.test_client().get("/api/report-requests")
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+
+def test_listing_query_count_does_not_grow_with_rows(app):
+    seed_reports(1)
+    rows, single = listing_statements(app)
+    assert len(rows) == 1
+
+    seed_reports(25, start=1)
+    rows, many = listing_statements(app)
+    assert len(rows) == 26
+    assert many == single
+
+
+def test_listing_includes_assignee_names(app):
+    seed_reports(2)
+    rows, _ = listing_statements(app)
+    assert {row["assignedTo"] for row in rows} == {"First0 Last0", "First1 Last1"}
+    assert all(row["locked"] for row in rows)
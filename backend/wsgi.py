@@ -0,0 +1,7 @@
+from dotenv import load_dotenv
+load_dotenv()
+
+from app import create_app
+
+# Production entry point: `gunicorn -c gunicorn.conf.py wsgi:app`
+app = create_app()